@@ -0,0 +1,793 @@
+"""An AVL tree engine storing its nodes in typed contiguous arrays"""
+
+import weakref
+from array import array
+
+
+class AVLNodePool(object):
+	"""
+    Fields:
+        'keys': array of int64, the key of every node
+        'values': list, the value of every node
+        'heights': array of int8, the height of every node
+        'sizes': array of int64, the number of real nodes in every node's subtree
+        'parents': array of int64, the parent handle of every node (0 if it is a root)
+        'lefts': array of int64, the left child handle of every node
+        'rights': array of int64, the right child handle of every node
+        'free_handles': list of handles released by deletions, reused by allocate
+        'removed_views': dict from weakrefs to views of removed nodes to their handles, see release_after
+    Output:
+        -
+    Description:
+        Struct-of-arrays storage for AVL nodes. A node is an integer handle indexing every column,
+        so a node costs one slot per column instead of a Python object tracked by the GC.
+        Handle 0 is the virtual node: height -1, size 0, and its links all point back to 0.
+        The columns support the buffer protocol, so e.g. numpy.frombuffer(pool.keys, dtype="int64")
+        gives a zero-copy view of them for vectorized passes.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	VIRTUAL = 0
+
+	def __init__(self):
+		self.keys = array("q", [0])
+		self.values = [None]
+		self.heights = array("b", [-1])
+		self.sizes = array("q", [0])
+		self.parents = array("q", [0])
+		self.lefts = array("q", [0])
+		self.rights = array("q", [0])
+		self.free_handles = []
+		self.removed_views = {}
+
+	def allocate(self, key, value=None, parent=0):
+		"""
+		Input:
+			'key': int
+			'value': string
+			'parent': int, handle of the new node's parent
+		Output:
+			@type: int
+			The handle of a new leaf node.
+		Description:
+			Reuses a handle released by a deletion if there is one, otherwise grows every column by one slot.
+		Time Complexity:
+			Overall O(1) amortized.
+		"""
+		if self.free_handles:
+			handle = self.free_handles.pop()
+			self.keys[handle] = key
+			self.values[handle] = value
+			self.heights[handle] = 0
+			self.sizes[handle] = 1
+			self.parents[handle] = parent
+			self.lefts[handle] = 0
+			self.rights[handle] = 0
+			return handle
+		self.keys.append(key)
+		self.values.append(value)
+		self.heights.append(0)
+		self.sizes.append(1)
+		self.parents.append(parent)
+		self.lefts.append(0)
+		self.rights.append(0)
+		return len(self.keys) - 1
+
+	def release(self, handle):
+		"""
+		Input:
+			'handle': int, a node that is no longer part of any tree
+		Output:
+			-
+		Description:
+			Drops the node's value and makes its handle available to allocate.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		self.values[handle] = None
+		self.free_handles.append(handle)
+
+	def release_after(self, node, handle):
+		"""
+		Input:
+			'node': AVLArrayNode instance or int handle, as the caller passed it to delete or split
+			'handle': int, the node's handle, no longer part of any tree
+		Output:
+			-
+		Description:
+			Defers release until the caller drops the view, so it keeps reading the removed node's
+			key and value as an AVLNode would. A plain int handle is released at once.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		if isinstance(node, AVLArrayNode):
+			self.removed_views[weakref.ref(node, self.release_view)] = handle
+		else:
+			self.release(handle)
+
+	def release_view(self, view_ref):
+		"""
+		Input:
+			'view_ref': weakref to the dropped view of a removed node
+		Output:
+			-
+		Description:
+			Callback of the weakrefs taken by release_after: releases the node's handle.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		self.release(self.removed_views.pop(view_ref))
+
+	def update(self, handle):
+		"""
+		Input:
+			'handle': int, a real node
+		Output:
+			-
+		Description:
+			Recalculates the node's height and subtree size from its children.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		left, right = self.lefts[handle], self.rights[handle]
+		self.heights[handle] = max(self.heights[left], self.heights[right]) + 1
+		self.sizes[handle] = self.sizes[left] + self.sizes[right] + 1
+
+	def build_balanced(self, items, start, end, parent=0):
+		"""
+		Input:
+			'items': list of (key, value) tuples sorted by key
+			'start', 'end': the slice of items to build from
+			'parent': int, handle of the parent of the built subtree
+		Output:
+			@type: int
+			The handle of the root of a perfectly balanced subtree holding items[start:end].
+		Description:
+			Takes the middle item as the root and builds both halves recursively.
+		Time Complexity:
+			O(end - start), every item is allocated once; the recursion depth is O(log n).
+		"""
+		if start >= end:
+			return 0
+		middle = (start + end) // 2
+		key, value = items[middle]
+		handle = self.allocate(key, value, parent)
+		left = self.build_balanced(items, start, middle, handle)
+		right = self.build_balanced(items, middle + 1, end, handle)
+		self.lefts[handle] = left
+		self.rights[handle] = right
+		self.update(handle)
+		return handle
+
+
+class AVLArrayNode(object):
+	"""
+    Fields:
+        'pool': AVLNodePool instance
+        'handle': int
+    Output:
+        -
+    Description:
+        A lightweight view of a pool node exposing the same fields as AVLNode,
+        so callers written against AVLNodeProtocol keep working. Views are created on demand
+        and compare equal when they refer to the same handle of the same pool.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	__slots__ = ("pool", "handle", "__weakref__")
+
+	def __init__(self, pool, handle):
+		self.pool = pool
+		self.handle = handle
+
+	def __eq__(self, other):
+		return isinstance(other, AVLArrayNode) and self.pool is other.pool and self.handle == other.handle
+
+	def __hash__(self):
+		return hash((id(self.pool), self.handle))
+
+	@property
+	def key(self):
+		return self.pool.keys[self.handle] if self.handle else None
+
+	@property
+	def value(self):
+		return self.pool.values[self.handle]
+
+	@value.setter
+	def value(self, value):
+		self.pool.values[self.handle] = value
+
+	@property
+	def parent(self):
+		parent = self.pool.parents[self.handle]
+		return AVLArrayNode(self.pool, parent) if parent else None
+
+	@property
+	def left(self):
+		return AVLArrayNode(self.pool, self.pool.lefts[self.handle])
+
+	@property
+	def right(self):
+		return AVLArrayNode(self.pool, self.pool.rights[self.handle])
+
+	@property
+	def height(self):
+		return self.pool.heights[self.handle]
+
+	@property
+	def size(self):
+		return self.pool.sizes[self.handle]
+
+	def is_real_node(self):
+		"""
+		Input:
+			self - a node
+		Output:
+			False if self is a virtual node, True otherwise.
+		Description:
+			Returns whether self is not a virtual node
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		return self.handle != AVLNodePool.VIRTUAL
+
+
+class AVLArrayTree(object):
+	"""
+	An AVL tree whose nodes live in an AVLNodePool, with the same API as AVLTree.
+	"""
+
+	def __init__(self, pool=None, root=0, max_handle=0, size=0):
+		"""
+        Fields:
+            'pool': AVLNodePool instance, shared by all trees produced from this one by split
+            'root': int, handle of the root (0 if the tree is empty)
+            'max_handle': int, handle of the node with the largest key
+            'tree_size': int, the number of real nodes in the tree
+        Output:
+            -
+        Description:
+            Constructor for AVLArrayTree. Trees sharing a pool can be joined without copying;
+            joining with a tree of another pool copies its nodes in first.
+            Node views stay valid while their node is in a tree. The view passed to delete or split
+            keeps reading the removed node until the caller drops it; any other view of that node
+            must not be used after the removal, as later insertions reuse its handle.
+
+        Time Complexity:
+            Overall O(1), as all methods are constant.
+        """
+		self.pool = pool if pool is not None else AVLNodePool()
+		self.root = root
+		self.max_handle = max_handle
+		self.tree_size = size
+
+	def node(self, handle):
+		"""
+		Input:
+			'handle': int
+		Output:
+			@type: AVLArrayNode
+			A view of the node, or None for the virtual node.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		return AVLArrayNode(self.pool, handle) if handle else None
+
+	def handle_of(self, node):
+		"""
+		Input:
+			'node': AVLArrayNode instance or int handle
+		Output:
+			@type: int
+			The handle of node in self's pool.
+		Description:
+			Raises ValueError if node is a view of another pool.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		if isinstance(node, AVLArrayNode):
+			if node.pool is not self.pool:
+				raise ValueError("node belongs to another pool")
+			return node.handle
+		return node
+
+	def get_balance_factor(self, handle):
+		"""
+		Input:
+			'handle': int
+		Output:
+			@type: int
+			The height of the left subtree minus the height of the right subtree.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		heights = self.pool.heights
+		return heights[self.pool.lefts[handle]] - heights[self.pool.rights[handle]]
+
+	def rearrange_parent(self, node, child):
+		"""
+		Input:
+			'node': int, a node being replaced
+			'child': int, the node taking its place
+		Output:
+			-
+		Description:
+			Links 'child' into the position formerly occupied by 'node' in node's parent.
+			If 'node' was a root, 'child' becomes a root; the caller keeps track of it.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		pool = self.pool
+		parent = pool.parents[node]
+		if parent:
+			if pool.lefts[parent] == node:
+				pool.lefts[parent] = child
+			else:
+				pool.rights[parent] = child
+		if child:
+			pool.parents[child] = parent
+
+	def left_rotation(self, node):
+		"""
+		Input:
+			'node': int
+		Output:
+			-
+		Description:
+			Performs a left rotation on the given 'node'.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		pool = self.pool
+		right_child = pool.rights[node]
+		self.rearrange_parent(node, right_child)
+		inner = pool.lefts[right_child]
+		pool.rights[node] = inner
+		if inner:
+			pool.parents[inner] = node
+		pool.lefts[right_child] = node
+		pool.parents[node] = right_child
+		pool.update(node)
+		pool.update(right_child)
+
+	def right_rotation(self, node):
+		"""
+		Input:
+			'node': int
+		Output:
+			-
+		Description:
+			Performs a right rotation on the given 'node'.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		pool = self.pool
+		left_child = pool.lefts[node]
+		self.rearrange_parent(node, left_child)
+		inner = pool.rights[left_child]
+		pool.lefts[node] = inner
+		if inner:
+			pool.parents[inner] = node
+		pool.rights[left_child] = node
+		pool.parents[node] = left_child
+		pool.update(node)
+		pool.update(left_child)
+
+	def rebalance_rotation(self, node):
+		"""
+		Input:
+			'node': int, a node whose balance factor is 2 or -2
+		Output:
+			-
+		Description:
+			Performs the single or double rotation restoring the AVL property at 'node'.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		if self.get_balance_factor(node) > 1:
+			if self.get_balance_factor(self.pool.lefts[node]) >= 0:
+				self.right_rotation(node)
+			else:
+				self.left_rotation(self.pool.lefts[node])
+				self.right_rotation(node)
+		else:
+			if self.get_balance_factor(self.pool.rights[node]) <= 0:
+				self.left_rotation(node)
+			else:
+				self.right_rotation(self.pool.rights[node])
+				self.left_rotation(node)
+
+	def rebalance_up(self, node):
+		"""
+		Input:
+			'node': int, the lowest node whose subtree changed
+		Output:
+			@type: (int, int)
+			The root reached by the climb and the number of PROMOTE cases on the way.
+		Description:
+			Climbs from 'node' to its root, rotating where the balance factor is out of range
+			and recalculating heights and sizes.
+		Time Complexity:
+			O(log n), one climb to the root.
+		"""
+		pool = self.pool
+		heights, lefts, rights = pool.heights, pool.lefts, pool.rights
+		promotions = 0
+		while True:
+			balance_factor = heights[lefts[node]] - heights[rights[node]]
+			if balance_factor > 1 or balance_factor < -1:
+				self.rebalance_rotation(node)
+				node = pool.parents[node]
+			if heights[node] < max(heights[lefts[node]], heights[rights[node]]) + 1:
+				promotions += 1
+			pool.update(node)
+			parent = pool.parents[node]
+			if not parent:
+				return node, promotions
+			node = parent
+
+	def find_max(self, handle):
+		"""
+		Input:
+			'handle': int, root of a subtree
+		Output:
+			@type: int
+			The node with the largest key in the subtree, 0 if it is empty.
+		Time Complexity:
+			O(log n).
+		"""
+		rights = self.pool.rights
+		while rights[handle]:
+			handle = rights[handle]
+		return handle
+
+	def search_from(self, handle, key):
+		"""
+		Input:
+			'handle': int, the node to start at
+			'key': int
+		Output:
+			@type: (int, int)
+			The handle of key (0 if not found) and the number of edges on the path +1 if found.
+		Time Complexity:
+			O(height of the subtree).
+		"""
+		keys, lefts, rights = self.pool.keys, self.pool.lefts, self.pool.rights
+		ed_vis = 0
+		while handle:
+			node_key = keys[handle]
+			if key == node_key:
+				return handle, ed_vis + 1
+			handle = lefts[handle] if key < node_key else rights[handle]
+			ed_vis += 1
+		return 0, ed_vis
+
+	def search(self, key):
+		"""
+		Input:
+			'key': int
+		Output:
+			a tuple (x,e) where x is the node corresponding to key (or None if not found),
+			and e is the number of edges on the path between the starting node and ending node+1.
+		Description:
+			searches for a node in the dictionary corresponding to the key, starting at the root
+		Time Complexity:
+			Overall O(log n).
+		"""
+		handle, ed_vis = self.search_from(self.root, key)
+		return self.node(handle), ed_vis
+
+	def finger_search(self, key):
+		"""
+		Input:
+			'key': int
+		Output:
+			a tuple (x,e) as in search.
+		Description:
+			searches for a node in the dictionary corresponding to the key, starting at the max
+		Time Complexity:
+			Overall O(log i) where i is the distance of key from the max.
+		"""
+		keys, parents = self.pool.keys, self.pool.parents
+		upwards_path_counter = 0
+		climbing_node = self.max_handle
+		while parents[climbing_node] and key <= keys[parents[climbing_node]]:
+			climbing_node = parents[climbing_node]
+			upwards_path_counter += 1
+		handle, ed_vis = self.search_from(climbing_node, key)
+		return self.node(handle), ed_vis + upwards_path_counter
+
+	def insert_from(self, start, key, val):
+		"""
+		Input:
+			'start': int, a real node whose subtree range contains key
+			'key': int
+			'val': string
+		Output:
+			@type: (int, int, int)
+			The new node, the number of edges descended and the number of PROMOTE cases.
+		Description:
+			Descends from 'start' to the insertion spot, attaches a new leaf and rebalances up to the root.
+		Time Complexity:
+			O(log n).
+		"""
+		pool = self.pool
+		keys, lefts, rights = pool.keys, pool.lefts, pool.rights
+		parent = 0
+		curr_node = start
+		e = 0
+		while curr_node:
+			parent = curr_node
+			curr_node = lefts[curr_node] if key < keys[curr_node] else rights[curr_node]
+			e += 1
+		new_node = pool.allocate(key, val, parent)
+		if key < keys[parent]:
+			lefts[parent] = new_node
+		else:
+			rights[parent] = new_node
+		self.root, promotions = self.rebalance_up(parent)
+		self.tree_size += 1
+		if not self.max_handle or keys[self.max_handle] < key:
+			self.max_handle = new_node
+		return new_node, e, promotions
+
+	def insert(self, key, val=""):
+		"""
+		Input:
+			'key': int, not currently in the tree
+			'val': string
+		Output:
+			a 3-tuple (x,e,h) where x is the new node,
+			e is the number of edges on the path between the starting node and new node before rebalancing,
+			and h is the number of PROMOTE cases during the AVL rebalancing
+		Description:
+			inserts a new node into the dictionary with corresponding key and value, starting at the root
+		Time Complexity:
+			Overall O(log n).
+		"""
+		if not self.root:
+			self.root = self.max_handle = self.pool.allocate(key, val)
+			self.tree_size = 1
+			return self.node(self.root), 0, 0
+		new_node, e, promotions = self.insert_from(self.root, key, val)
+		return self.node(new_node), e, promotions
+
+	def finger_insert(self, key, val=""):
+		"""
+		Input:
+			'key': int, not currently in the tree
+			'val': string
+		Output:
+			a 3-tuple (x,e,h) as in insert.
+		Description:
+			inserts a new node into the dictionary with corresponding key and value, starting at the max
+		Time Complexity:
+			Overall O(log i) search where i is the distance of key from the max, plus rebalancing.
+		"""
+		if not self.root:
+			return self.insert(key, val)
+		keys, parents = self.pool.keys, self.pool.parents
+		upwards_path_counter = 0
+		climbing_node = self.max_handle
+		while parents[climbing_node] and key < keys[parents[climbing_node]]:
+			climbing_node = parents[climbing_node]
+			upwards_path_counter += 1
+		new_node, e, promotions = self.insert_from(climbing_node, key, val)
+		return self.node(new_node), e + upwards_path_counter, promotions
+
+	def delete(self, node):
+		"""
+		Input:
+			'node': AVLArrayNode instance or int handle of a node in self
+		Output:
+			-
+		Description:
+			Removes the node as in a regular BST (replacing a two-child node by its successor),
+			then rebalances from the lowest changed node up to the root. The handle is released
+			once the caller drops 'node' (see AVLNodePool.release_after).
+		Time Complexity:
+			O(log n).
+		"""
+		pool = self.pool
+		lefts, rights, parents = pool.lefts, pool.rights, pool.parents
+		handle = self.handle_of(node)
+		if lefts[handle] and rights[handle]:
+			successor = rights[handle]
+			while lefts[successor]:
+				successor = lefts[successor]
+			start = parents[successor] if parents[successor] != handle else successor
+			self.rearrange_parent(successor, rights[successor])
+			lefts[successor] = lefts[handle]
+			parents[lefts[successor]] = successor
+			rights[successor] = rights[handle]
+			if rights[successor]:
+				parents[rights[successor]] = successor
+			self.rearrange_parent(handle, successor)
+			if self.root == handle:
+				self.root = successor
+		else:
+			child = lefts[handle] or rights[handle]
+			start = parents[handle]
+			self.rearrange_parent(handle, child)
+			if self.root == handle:
+				self.root = child
+		if start:
+			self.root = self.rebalance_up(start)[0]
+		self.tree_size -= 1
+		if self.max_handle == handle:
+			self.max_handle = self.find_max(self.root)
+		pool.release_after(node, handle)
+
+	def join_handles(self, left, x, right):
+		"""
+		Input:
+			'left': int, root of a subtree whose keys are all smaller than x's key (0 if empty)
+			'x': int, a detached node
+			'right': int, root of a subtree whose keys are all larger than x's key (0 if empty)
+		Output:
+			@type: int
+			The root of the joined subtree.
+		Description:
+			Descends the spine of the taller subtree to a node whose height matches the shorter one,
+			hangs x there with the shorter subtree as its other child and rebalances upwards.
+		Time Complexity:
+			O(|height(left) - height(right)| + 1).
+		"""
+		pool = self.pool
+		heights, lefts, rights, parents = pool.heights, pool.lefts, pool.rights, pool.parents
+		parent = 0
+		if heights[left] > heights[right] + 1:
+			while heights[left] > heights[right] + 1:
+				parent, left = left, rights[left]
+			rights[parent] = x
+		elif heights[right] > heights[left] + 1:
+			while heights[right] > heights[left] + 1:
+				parent, right = right, lefts[right]
+			lefts[parent] = x
+		parents[x] = parent
+		lefts[x] = left
+		rights[x] = right
+		if left:
+			parents[left] = x
+		if right:
+			parents[right] = x
+		return self.rebalance_up(x)[0]
+
+	def adopt(self, tree2):
+		"""
+		Input:
+			'tree2': AVLArrayTree instance
+		Output:
+			@type: int
+			The root of a copy of tree2's nodes in self's pool.
+		Description:
+			Trees of different pools cannot share handles, so tree2's nodes are rebuilt into self's pool.
+		Time Complexity:
+			O(m) where m is the size of tree2.
+		"""
+		items = tree2.avl_to_array()
+		return self.pool.build_balanced(items, 0, len(items))
+
+	def join(self, tree2, key, val=""):
+		"""
+		Input:
+			'tree2': AVLArrayTree instance whose keys are all smaller or all larger than key,
+			and self's keys are on the other side of key.
+			'key': int
+			'val': string
+		Output:
+			-
+		Description:
+			Merges self, a new node (key, val) and tree2 into self. After the join, tree2 becomes empty.
+		Time Complexity:
+			O(|height(self) - height(tree2)| + 1) when both trees share a pool,
+			plus O(m) to copy tree2 in otherwise.
+		"""
+		keys = self.pool.keys
+		other_root = tree2.root if tree2.pool is self.pool else self.adopt(tree2)
+		other_max = tree2.max_handle if tree2.pool is self.pool else self.find_max(other_root)
+		if (self.root and keys[self.root] > key) or (other_root and keys[other_root] < key):
+			left, right, right_max = other_root, self.root, self.max_handle
+		else:
+			left, right, right_max = self.root, other_root, other_max
+		x = self.pool.allocate(key, val)
+		self.root = self.join_handles(left, x, right)
+		self.tree_size = self.pool.sizes[self.root]
+		self.max_handle = right_max if right else x
+		tree2.root, tree2.max_handle, tree2.tree_size = 0, 0, 0
+
+	def split(self, node):
+		"""
+		Input:
+			'node': AVLArrayNode instance or int handle of a node in self
+		Output:
+			@type: (AVLArrayTree, AVLArrayTree)
+			The trees of the keys smaller than node.key and of the keys larger than node.key.
+		Description:
+			Climbs from 'node' to the root, joining every ancestor with its subtree on the matching side.
+			Ancestors are reused as the separating nodes of the joins, so no node is allocated,
+			and both results share self's pool. self is left empty; 'node' stays readable
+			until the caller drops it, so its key and value can separate a later join.
+		Time Complexity:
+			O(log n), the joins along the path telescope.
+		"""
+		pool = self.pool
+		lefts, rights, parents = pool.lefts, pool.rights, pool.parents
+		handle = self.handle_of(node)
+		left, right = lefts[handle], rights[handle]
+		parents[left] = parents[right] = 0
+		curr_node, ancestor = handle, parents[handle]
+		while ancestor:
+			next_ancestor = parents[ancestor]
+			if rights[ancestor] == curr_node:
+				ancestor_left = lefts[ancestor]
+				parents[ancestor_left] = 0
+				left = self.join_handles(ancestor_left, ancestor, left)
+			else:
+				ancestor_right = rights[ancestor]
+				parents[ancestor_right] = 0
+				right = self.join_handles(right, ancestor, ancestor_right)
+			curr_node, ancestor = ancestor, next_ancestor
+		parents[0] = 0
+		pool.release_after(node, handle)
+		l_side = AVLArrayTree(pool, left, self.find_max(left), pool.sizes[left])
+		r_side = AVLArrayTree(pool, right, self.find_max(right), pool.sizes[right])
+		self.root, self.max_handle, self.tree_size = 0, 0, 0
+		return l_side, r_side
+
+	def avl_to_array(self):
+		"""
+		Input:
+			'self' is the tree we traverse
+		Output:
+			a sorted list according to key of tuples (key, value) representing the data structure
+		Description:
+			iterative inorder traversal with an explicit stack of handles
+		Time Complexity:
+			O(n)
+		"""
+		keys, values, lefts, rights = self.pool.keys, self.pool.values, self.pool.lefts, self.pool.rights
+		result = []
+		stack = []
+		handle = self.root
+		while stack or handle:
+			while handle:
+				stack.append(handle)
+				handle = lefts[handle]
+			handle = stack.pop()
+			result.append((keys[handle], values[handle]))
+			handle = rights[handle]
+		return result
+
+	def max_node(self):
+		"""
+		Output:
+			@type: AVLArrayNode
+			The maximal node of 'self', None if the tree is empty.
+		Time Complexity:
+			O(1).
+		"""
+		return self.node(self.max_handle)
+
+	def size(self):
+		"""
+		Output:
+			@type: int
+			The number of items in 'self'.
+		Time Complexity:
+			O(1).
+		"""
+		return self.tree_size
+
+	def get_root(self):
+		"""
+		Output:
+			@type: AVLArrayNode
+			The root of 'self', None if the tree is empty.
+		Time Complexity:
+			O(1).
+		"""
+		return self.node(self.root)
@@ -1,5 +1,12 @@
 """A class represnting a node in an AVL tree"""
 
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter, defaultdict
+from itertools import accumulate
+
 
 class AVLNode(object):
 	"""
@@ -10,14 +17,19 @@ class AVLNode(object):
         'left': AVLNode instance
         'right': AVLNode instance
         'height': int
+        'size': int, the number of real nodes in the subtree rooted at the node
+        'prev', 'next': AVLNode instances or None, the in-order neighbours of the node in its tree
     Output:
         -
     Description:
-        Constructor for AVLNode. if empty, height is -1
+        Constructor for AVLNode. if empty, height is -1 and size is 0
+        The fields are declared in __slots__, so a node carries no instance __dict__.
+        prev and next thread the nodes of a tree in key order; None marks the min and max nodes.
 
     Time Complexity:
         Overall O(1), as all methods are constant.
     """
+	__slots__ = ("key", "value", "parent", "left", "right", "height", "size", "prev", "next")
 	virtual_node = None
 
 	def __init__(self, key=None, value=None, parent=None):
@@ -27,6 +39,26 @@ class AVLNode(object):
 		self.left = AVLNode.virtual_node
 		self.right = AVLNode.virtual_node
 		self.height = 0 if self.is_real_node() is True else -1
+		self.size = 1 if self.is_real_node() is True else 0
+		self.prev = None
+		self.next = None
+
+	@staticmethod
+	def memory_footprint():
+		"""
+		Input:
+			-
+		Output:
+			@type: int
+			The number of bytes a single real node occupies.
+		Description:
+			Measures a freshly created real node with sys.getsizeof.
+			The node is slotted, so there is no instance __dict__ to add on top of it;
+			the key and value objects themselves are not included.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		return sys.getsizeof(AVLNode(0))
 
 	def get_parent(self):
 		"""
@@ -92,11 +124,25 @@ class AVLNode(object):
 			self - a node
 		Output: -
 		Description:
-			update node's height
+			update node's height, and its subtree size with it
 		Time Complexity:
 			Overall O(1), as all methods are constant.
 		"""
 		self.height = self.find_height()
+		if self.is_real_node():
+			self.update_size()
+
+	def update_size(self):
+		"""
+		Input:
+			self - a real node
+		Output: -
+		Description:
+			update the number of real nodes in node's subtree using the sizes of its children
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		self.size = self.left.size + self.right.size + 1
 
 	def successor(self):
 		"""
@@ -105,28 +151,24 @@ class AVLNode(object):
 		Output:
 			the successor of self
 		Description:
-			if node has a right node, traverse to its left most child(repeatedly), returning it
-			otherwise, climb up until we reach the first node that's not the right child of its parent,
-			if it has a parent return it, otherwise, return virtual node, as there's no successor(it's the max node)
+			follows the 'next' thread; returns virtual node if there's no successor(it's the max node)
 		Time Complexity:
-			O(log n)
-			The time complexity for this method is O(log n).
-			The method traverses at most two path:
-				1. From the node up to the root.
-				2. From root to nodes successor.
-			The length of each path is at most O(log n).
-			Thus,overall the time complexity of this method is O(log n).
-		"""
-		curr_node = self
-		if not curr_node.right.is_real_node():
-			while curr_node.parent and curr_node.parent.right == curr_node:
-				curr_node = curr_node.parent
-			return curr_node.parent if curr_node.parent else AVLNode.virtual_node
-		else:
-			curr_node = curr_node.right
-			while curr_node.left.is_real_node():
-				curr_node = curr_node.left
-		return curr_node
+			Overall O(1), as all methods are constant.
+		"""
+		return self.next if self.next is not None else AVLNode.virtual_node
+
+	def predecessor(self):
+		"""
+		Input:
+			self - a node
+		Output:
+			the predecessor of self
+		Description:
+			mirror image of successor: follows the 'prev' thread, virtual node if it's the min node
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		return self.prev if self.prev is not None else AVLNode.virtual_node
 
 	def update_parent(self, up_parent):
 		"""
@@ -284,25 +326,122 @@ A class implementing an AVL tree.
 """
 
 
+class AVLTreeStats(object):
+	"""
+    Fields:
+        'operations': Counter of the calls of every counted operation
+        'path_lengths': dict from operation name to a Counter of the e values (edges + 1) it reported
+        'promotions': int, the PROMOTE cases reported by the inserts
+        'single_rotations', 'double_rotations': int, the rotations made by rebalance_rotation
+        'rebalance_steps': int, the nodes whose height and balance the inserts and deletes re-examined
+        'join_height_differences': Counter of the height differences of the non-empty trees joined
+        'split_pieces': Counter of the number of pieces every split joined on its way up
+    Output:
+        -
+    Description:
+        Aggregate counters of an AVLTree, enabled with AVLTree.enable_stats. Joins and splits made
+        internally by split, concat and the set operations are counted as well.
+        Updates are not synchronized: concurrent readers of a shared tree may lose counts.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+
+	def __init__(self):
+		self.operations = Counter()
+		self.path_lengths = defaultdict(Counter)
+		self.promotions = 0
+		self.single_rotations = 0
+		self.double_rotations = 0
+		self.rebalance_steps = 0
+		self.join_height_differences = Counter()
+		self.split_pieces = Counter()
+
+	def record(self, operation, edges=None, promotions=0):
+		"""
+		Input:
+			'operation': string, the name of the operation
+			'edges': int or None, the e value the operation returned
+			'promotions': int, the h value the operation returned
+		Output:
+			-
+		Time Complexity:
+			O(1).
+		"""
+		self.operations[operation] += 1
+		if edges is not None:
+			self.path_lengths[operation][edges] += 1
+		self.promotions += promotions
+
+	@staticmethod
+	def percentile(histogram, fraction):
+		"""
+		Input:
+			'histogram': Counter from values to counts
+			'fraction': float between 0 and 1
+		Output:
+			the smallest value such that at least 'fraction' of the counts are at or below it, None if empty.
+		Time Complexity:
+			O(k log k) for k distinct values.
+		"""
+		total = sum(histogram.values())
+		seen = 0
+		for value in sorted(histogram):
+			seen += histogram[value]
+			if seen >= fraction * total:
+				return value
+		return None
+
+	def summary(self):
+		"""
+		Input:
+			'self': AVLTreeStats instance
+		Output:
+			@type: dict
+			the counters, plus the mean, p50 and p99 path length of every operation that reports one.
+		Time Complexity:
+			O(k log k) for k distinct path lengths.
+		"""
+		paths = {}
+		for operation, histogram in self.path_lengths.items():
+			count = sum(histogram.values())
+			paths[operation] = {"mean": sum(e * n for e, n in histogram.items()) / count,
+								"p50": self.percentile(histogram, 0.5), "p99": self.percentile(histogram, 0.99)}
+		return {"operations": dict(self.operations), "path_lengths": paths, "promotions": self.promotions,
+				"single_rotations": self.single_rotations, "double_rotations": self.double_rotations,
+				"rebalance_steps": self.rebalance_steps,
+				"join_height_differences": dict(self.join_height_differences),
+				"split_pieces": dict(self.split_pieces)}
+
+
 class AVLTree(object):
 	"""
 	Constructor, you are allowed to add more fields.
 	"""
 	if AVLNode.virtual_node is None:
 		AVLNode.virtual_node = AVLNode(None, None)
+	# The node type created by insertions, joins and bulk builds; subclasses with augmented nodes override it
+	node_class = AVLNode
+	# AVLTreeStats instance collecting counters, see enable_stats; None (the default) skips all counting
+	stats = None
+	# Snapshot header: magic, format version, typecode of the key deltas, item count
+	SNAPSHOT_HEADER = struct.Struct("<4sBcxxq")
+	SNAPSHOT_MAGIC = b"AVLT"
+	SNAPSHOT_VERSION = 1
 
 	def __init__(self, root: AVLNode = AVLNode.virtual_node, max_tree_node: AVLNode = AVLNode.virtual_node,
-				 size: int = 0):
+				 size: int = 0, min_tree_node: AVLNode = AVLNode.virtual_node):
 		"""
         Fields:
             'root': AVLNode instance
             'max_tree_node': AVLNode instance
             'size': int
+            'min_tree_node': AVLNode instance
         Output:
             -
         Description:
             Constructor for AVLTree. If 'root' is a virtual node, the tree is considered empty.
-            'max_tree_node' tracks the node with the largest key.
+            'max_tree_node' tracks the node with the largest key, 'min_tree_node' the one with the smallest.
             'size' maintains the current number of real nodes in the tree.
 
         Time Complexity:
@@ -310,6 +449,7 @@ class AVLTree(object):
         """
 		self.root = root
 		self.max_tree_node = max_tree_node
+		self.min_tree_node = min_tree_node
 		self.tree_size = size
 
 	def convert_tree(self, tree):
@@ -320,7 +460,7 @@ class AVLTree(object):
         Output:
             -
         Description:
-            Copies the root, size, and max_tree_node from 'tree' into self.
+            Copies the root, size, max_tree_node and min_tree_node from 'tree' into self.
             Useful when we want to "turn" self into another tree without reconstructing nodes.
 
         Time Complexity:
@@ -331,6 +471,7 @@ class AVLTree(object):
 		self.root = tree.root
 		self.tree_size = tree.tree_size
 		self.max_tree_node = tree.max_tree_node
+		self.min_tree_node = tree.min_tree_node
 
 	def update_max_node(self, node: AVLNode):
 		"""
@@ -349,6 +490,23 @@ class AVLTree(object):
 		if not self.max_tree_node.is_real_node() or self.max_tree_node.key < node.key:
 			self.max_tree_node = node
 
+	def update_min_node(self, node: AVLNode):
+		"""
+        Input:
+            'self': AVLTree instance
+            'node': AVLNode instance
+        Output:
+            -
+        Description:
+            Updates the tree's min_tree_node if the given 'node' has a smaller key.
+            If the tree was empty, node becomes the new min by default.
+
+        Time Complexity:
+            Overall O(1), as all methods are constant, only compares two given nodes.
+        """
+		if not self.min_tree_node.is_real_node() or node.key < self.min_tree_node.key:
+			self.min_tree_node = node
+
 	def fix_root(self):
 		"""
         Input:
@@ -361,10 +519,44 @@ class AVLTree(object):
         Time Complexity:
             Overall O(log n) in a balanced AVL, worst case O(h).
         """
-		# Find the new root
+		# Not needed after insert, delete or join: rearrange_parent tracks the root during rotations
 		while self.root.parent:
 			self.root = self.root.parent
 
+	def enable_stats(self):
+		"""
+		Input:
+			'self': AVLTree instance
+		Output:
+			@type: AVLTreeStats instance
+			the fresh counters that self's operations update from now on.
+		Description:
+			Statistics are off by default: every counted operation then costs one attribute check.
+		Time Complexity:
+			O(1).
+		"""
+		self.stats = AVLTreeStats()
+		return self.stats
+
+	def disable_stats(self):
+		self.stats = None
+
+	def make_tree(self, root=AVLNode.virtual_node, size=0):
+		"""
+		Input:
+			'self': AVLTree instance
+			'root': AVLNode instance
+			'size': int
+		Output:
+			@type: AVLTree instance
+			a tree of self's class over root, sharing self's stats, for the pieces of splits and set operations.
+		Time Complexity:
+			O(1).
+		"""
+		tree = type(self)(root, size=size)
+		tree.stats = self.stats
+		return tree
+
 	def create_root(self, key, val=None):
 		"""
         Input:
@@ -382,10 +574,86 @@ class AVLTree(object):
 			new_root = AVLNode.virtual_node
 			self.tree_size = 0
 		else:
-			new_root = AVLNode(key=key, value=val)
+			new_root = self.node_class(key=key, value=val)
 			self.tree_size = 1
 		self.root = new_root
 		self.max_tree_node = new_root
+		self.min_tree_node = new_root
+
+	def build_balanced(self, items, start, end, parent=None, last=None):
+		"""
+		Input:
+			'items': list of (key, value) tuples sorted by key
+			'start', 'end': the slice of items to build from
+			'parent': AVLNode instance, the parent of the built subtree
+			'last': one-element list holding the node built before the slice (None at the start),
+			updated to the last node of the slice
+		Output:
+			@type: AVLNode instance
+			The root of a perfectly balanced subtree holding items[start:end],
+			a virtual node if the slice is empty.
+		Description:
+			Takes the middle item as the root, builds both halves recursively and links them to it.
+			Nodes are created in key order, so each one is threaded to the node built just before it.
+		Time Complexity:
+			O(end - start), every item becomes one node; the recursion depth is O(log n).
+		"""
+		if start >= end:
+			return AVLNode.virtual_node
+		if last is None:
+			last = [None]
+		middle = (start + end) // 2
+		key, val = items[middle]
+		node = self.node_class(key, val, parent)
+		node.left = self.build_balanced(items, start, middle, node, last)
+		node.prev = last[0]
+		if node.prev is not None:
+			node.prev.next = node
+		last[0] = node
+		node.right = self.build_balanced(items, middle + 1, end, node, last)
+		node.update_height()
+		return node
+
+	@classmethod
+	def from_sorted(cls, iterable):
+		"""
+		Input:
+			'iterable': (key, value) tuples, or bare keys (stored with an empty value), in increasing key order
+		Output:
+			@type: AVLTree instance
+			A perfectly balanced tree holding the given items.
+		Description:
+			Builds the tree bottom-up from the sorted items instead of inserting them one by one,
+			so no search, rebalancing or root fixing takes place.
+			Raises ValueError if the keys are not strictly increasing.
+		Time Complexity:
+			O(n).
+		"""
+		return cls().build_from_sorted(iterable)
+
+	def build_from_sorted(self, iterable):
+		"""
+		Input:
+			'self': empty AVLTree instance
+			'iterable': as in from_sorted
+		Output:
+			@type: AVLTree instance
+			self, holding the given items.
+		Description:
+			The body of from_sorted, on an existing tree, so the nodes are of self's node_class:
+			insert_many builds its batch tree with self.make_tree().
+		Time Complexity:
+			O(n).
+		"""
+		items = [item if isinstance(item, tuple) else (item, "") for item in iterable]
+		for i in range(1, len(items)):
+			if not items[i - 1][0] < items[i][0]:
+				raise ValueError("keys must be strictly increasing, got %r before %r" % (items[i - 1][0], items[i][0]))
+		self.root = self.build_balanced(items, 0, len(items))
+		self.max_tree_node = self.find_max()
+		self.min_tree_node = self.find_min()
+		self.tree_size = len(items)
+		return self
 
 	def rearrange_parent(self, node, child):
 		"""
@@ -398,6 +666,8 @@ class AVLTree(object):
 			Reconnects 'child' into the position formerly occupied by 'node'.
             If 'node' was the root, 'child' becomes the new root.
             Otherwise, we update node's parent's left/right child accordingly.
+            The side is found by identity rather than by comparing keys, so trees whose order is
+            implicit (see RopeAVLTree) rotate the same way.
 		Time Complexity:
 			Overall O(1), as all methods are constant.
 		"""
@@ -406,7 +676,7 @@ class AVLTree(object):
 			self.root = child
 			child.update_parent(None)
 		else:
-			if node.key <= parent.key:
+			if parent.left is node:
 				parent.update_left_child(child)
 			else:
 				parent.update_right_child(child)
@@ -464,17 +734,24 @@ class AVLTree(object):
 			Overall O(1), as all methods are constant.
 		"""
 		if node.get_balance_factor() == 2:  # left in-balanced
-			if node.left.get_balance_factor() == 1:
+			single = node.left.get_balance_factor() >= 0
+			if single:
 				self.right_rotation(node)
 			else:
 				self.left_rotation(node.left)
 				self.right_rotation(node)
 		else:  # Right in-balanced
-			if node.right.get_balance_factor() == -1:
+			single = node.right.get_balance_factor() <= 0
+			if single:
 				self.left_rotation(node)
 			else:
 				self.right_rotation(node.right)
 				self.left_rotation(node)
+		if self.stats is not None:
+			if single:
+				self.stats.single_rotations += 1
+			else:
+				self.stats.double_rotations += 1
 
 	"""searches for a node in the dictionary corresponding to the key (starting at the root)
 		
@@ -498,7 +775,24 @@ class AVLTree(object):
 		Time Complexity:
 			Overall O(log n) at worst case(as seen in class), potentially faster if the finger is near insertion spot.
 		"""
-		c_node = self.root
+		result = self.search_from(self.root, key)
+		if self.stats is not None:
+			self.stats.record("search", result[1])
+		return result
+
+	def search_from(self, c_node, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'c_node': AVLNode instance, the node to start from
+			'key': int
+		Output:
+			a tuple (x,e) as returned by search, for the descent from c_node.
+		Description:
+			The descent shared by search and the finger searches.
+		Time Complexity:
+			O(h) for the height h of c_node.
+		"""
 		ed_vis = 0
 		while c_node.is_real_node():
 			if key == c_node.key:
@@ -513,6 +807,98 @@ class AVLTree(object):
 			c_node = None
 		return (c_node, ed_vis)
 
+	def locate(self, c_node, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'c_node': AVLNode instance, a real node whose subtree key range contains key
+			'key': int
+		Output:
+			a tuple (x,p,e) where x is the node of key (None if not found), p is the last real node
+			of the descent (x itself if found, the parent a new node of key would get otherwise),
+			and e is the number of edges descended from c_node to p.
+		Description:
+			The descent of search_from, keeping the node where it ends, so a missing key can be
+			linked right there without a second descent (see upsert and join_node).
+		Time Complexity:
+			O(h) for the height h of c_node.
+		"""
+		e = 0
+		while True:
+			node_key = c_node.key
+			if key == node_key:
+				return c_node, c_node, e
+			child = c_node.left if key < node_key else c_node.right
+			if child.key is None:
+				return None, c_node, e
+			c_node = child
+			e += 1
+
+	def climb_towards(self, node, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'node': AVLNode instance, a real node of self (the finger)
+			'key': int
+		Output:
+			a tuple (v,c) where v is the lowest ancestor of node (or node itself) whose subtree
+			key range contains key, and c is the number of edges climbed to reach it.
+		Description:
+			Moving to a larger key, the subtree of a left child is left behind as soon as key passes
+			its parent; moving to a smaller key, the same holds for a right child. The climb stops
+			at the first node whose bound on the side of key is not yet passed.
+		Time Complexity:
+			O(log d), where d is the number of keys between node.key and key.
+		"""
+		climbed = 0
+		if node.key <= key:
+			while node.parent and not (node.parent.left == node and key < node.parent.key):
+				node = node.parent
+				climbed += 1
+		else:
+			while node.parent and not (node.parent.right == node and node.parent.key < key):
+				node = node.parent
+				climbed += 1
+		return node, climbed
+
+	def search_many(self, keys):
+		"""
+		Input:
+			'self': AVLTree instance
+			'keys': a sequence of int keys, or a NumPy array of them
+		Output:
+			a list holding, for every key in the caller's order, a tuple (x,e) as returned by search:
+			x is the node of the key (or None if not found) and e is the number of edges on the path
+			between the starting node and ending node+1.
+		Description:
+			Visits the probes in sorted order. The first one is searched from the root; every following
+			one starts at the last real node the previous search reached, climbs with climb_towards
+			only as far as needed and descends from there, so consecutive probes share their common
+			path prefix. Edges climbed are counted in e, as in finger_search.
+		Time Complexity:
+			O(k log k) to sort the probes plus O(k log(n/k + 1)) to walk the tree for k probes.
+		"""
+		keys = keys.tolist() if hasattr(keys, "tolist") else list(keys)
+		results = [(None, 0)] * len(keys)
+		if not self.root.is_real_node():
+			return results
+		finger = self.root
+		for index in sorted(range(len(keys)), key=keys.__getitem__):
+			key = keys[index]
+			node, ed_vis = self.climb_towards(finger, key)
+			while True:
+				ed_vis += 1
+				if key == node.key:
+					results[index] = (node, ed_vis)
+					break
+				child = node.left if key < node.key else node.right
+				if not child.is_real_node():
+					results[index] = (None, ed_vis)
+					break
+				node = child
+			finger = node
+		return results
+
 	"""searches for a node in the dictionary corresponding to the key, starting at the max
 	
 	@type key: int
@@ -540,10 +926,10 @@ class AVLTree(object):
 		while climbing_node.parent is not None and key <= climbing_node.parent.key:
 			climbing_node = climbing_node.parent
 			upwards_path_counter += 1
-		result = list(AVLTree(climbing_node).search(key))
-		#print("e:",result[1])
-		#print("upwards_path_counter:", upwards_path_counter)
+		result = list(self.search_from(climbing_node, key))
 		result[1] = result[1] + upwards_path_counter
+		if self.stats is not None:
+			self.stats.record("finger_search", result[1])
 		return tuple(result)
 
 	"""inserts a new node into the dictionary with corresponding key and value (starting at the root)
@@ -576,34 +962,63 @@ class AVLTree(object):
 			Overall O(log n) in the worst case, potentially faster if the finger is near the insertion spot.
 		"""
 		self.tree_size += 1
-		parent_node = None
 		curr_node = self.get_root()  # Trace route to insertion to get the parent
-		e = 0  # path counter
 		# Case 1: Parent is None(Empty tree)
 		if not curr_node:
 			self.create_root(key, val)
-			return self.root, e, 0
+			result = self.root, 0, 0
+		else:
+			result = self.insert_from(curr_node, key, val)
+		if self.stats is not None:
+			self.stats.record("insert", result[1], result[2])
+		return result
 
-		# Binary search - find the correct spot
-		while curr_node.is_real_node():
-			parent_node = curr_node
-			if key < curr_node.key:
-				curr_node = curr_node.left
-			else:
-				curr_node = curr_node.right
-			e += 1
+	def insert_from(self, curr_node, key, val):
+		"""
+		Input:
+			'self': non-empty AVLTree instance
+			'curr_node': AVLNode instance, a real node whose subtree key range contains key
+			'key': int
+			'val': string
+		Output:
+			a 3-tuple (x,e,h) as returned by insert, e counted from curr_node.
+		Description:
+			The part of insert shared with the finger inserts: descends from curr_node to the insertion
+			spot, links and threads the new node, rebalances and updates the min and max nodes.
+			tree_size is left to the caller. The root is tracked by the rotations, so no fix_root is needed.
+		Time Complexity:
+			O(h) for the height h of curr_node to find the spot, O(1) amortized rebalancing plus the
+			O(log n) size updates.
+		"""
 		# Creating new node to insert
-		new_node = AVLNode(key, val, parent_node)
-		# Case 2: Set the new node as a child of the parent
-		if key < parent_node.key:
-			parent_node.left = new_node
+		new_node = self.node_class(key, val)
+		e = self.link_leaf(curr_node, new_node)
+		return new_node, e, self.complete_insertion(new_node)
+
+	def complete_insertion(self, new_node):
+		"""
+		Input:
+			'self': AVLTree instance
+			'new_node': AVLNode instance, a leaf just linked by link_leaf
+		Output:
+			@type: int
+			the number of PROMOTE cases during the rebalancing.
+		Description:
+			Threads new_node next to its parent, rebalances above it and updates the min and max nodes.
+		Time Complexity:
+			O(1) amortized rebalancing plus the O(log n) size updates.
+		"""
+		# Thread the new node next to its parent
+		parent_node = new_node.parent
+		if new_node.key < parent_node.key:
+			self.thread_between(parent_node.prev, new_node, parent_node)
 		else:
-			parent_node.right = new_node
+			self.thread_between(parent_node, new_node, parent_node.next)
+		# After a new node is added, restore balance
 		promotions = self.insertion_rebalance(parent_node)
-		self.fix_root()  # Fixing root - O(log(n))
 		self.update_max_node(new_node)  # Check (& Update if necessary) tree's max node
-		# After a new node is added, restore balance
-		return new_node, e, promotions
+		self.update_min_node(new_node)
+		return promotions
 
 	def insertion_rebalance(self, node: AVLNode):
 		"""
@@ -614,25 +1029,51 @@ class AVLTree(object):
 			@type: int
 			returns the number of times a PROMOTE operation occurred (height increment).
 		Description:
-			After a new node is inserted, we traverse up from 'node' to the root,
+			After a new node is inserted, we traverse up from 'node' (the new node's parent),
 			updating heights and checking balance factors. If any balance factor is out of range,
 			we fix it via rebalance_rotation. We keep track of how many times the height
 			was promoted (i.e., node.height increased).
+			The climb stops at the first node whose height does not change, or after a rotation,
+			which always restores the height the subtree had before the insertion: nothing above
+			can change height or balance. Only the subtree sizes are then updated up to the root.
 		Time Complexity:
-			Overall O(log n) - we ascend to the root at most O(log n) steps.
+			O(1) amortized rebalancing steps, plus O(log n) size updates.
 		"""
 		h = 0
+		steps = 0
 		while node:
-			balance_factor = node.get_balance_factor()
-			if abs(balance_factor) <= 1:
-				if node.height < node.find_height():
-					h += 1
-				node.update_height()
-				node = node.get_parent()
-			else:
+			steps += 1
+			if abs(node.get_balance_factor()) > 1:
 				self.rebalance_rotation(node)
+				node = node.parent  # the root of the rotated subtree, sizes already updated
+				break
+			if node.height == node.find_height():
+				break
+			h += 1
+			node.update_height()
+			node = node.parent
+		if self.stats is not None:
+			self.stats.rebalance_steps += steps
+		self.update_sizes_upwards(node)
 		return h
 
+	def update_sizes_upwards(self, node):
+		"""
+		Input:
+			'self': AVLTree instance
+			'node': AVLNode instance or None
+		Output:
+			-
+		Description:
+			Refreshes the subtree size of node and of all its ancestors, once a rebalancing climb
+			stopped below the root: their heights are right, their sizes are off by one.
+		Time Complexity:
+			O(log n).
+		"""
+		while node:
+			node.update_size()
+			node = node.parent
+
 	"""inserts a new node into the dictionary with corresponding key and value, starting at the max
 
 	@type key: int
@@ -663,62 +1104,301 @@ class AVLTree(object):
 		"""
 		self.tree_size += 1
 		if not self.root.is_real_node():
-			result = list(self.insert(key, val))
-			return (result[0], result[1] + 0, result[2])
+			self.create_root(key, val)
+			result = (self.root, 0, 0)
+		else:
+			upwards_path_counter = 0
+			climbing_node = self.max_tree_node
+			while climbing_node.parent is not None and key < climbing_node.parent.key:
+				climbing_node = climbing_node.parent
+				upwards_path_counter += 1
+			result = list(self.insert_from(climbing_node, key, val))
+			result = (result[0], result[1] + upwards_path_counter, result[2])
+		if self.stats is not None:
+			self.stats.record("finger_insert", result[1], result[2])
+		return result
+
+	def min_finger_search(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int
+		Output:
+			a tuple (x,e) where x is the node corresponding to key (or None if not found),
+			and e is the number of edges on the path between the starting node and ending node+1.
+		Description:
+			searches for a node in the dictionary corresponding to the key, starting at the min.
+			Mirror image of finger_search: climbs the left spine while key is not smaller than the parent.
+		Time Complexity:
+			O(log d), where d is the number of keys smaller than key.
+		"""
 		upwards_path_counter = 0
-		climbing_node = self.max_tree_node
-		while climbing_node.parent is not None and key < climbing_node.parent.key:
+		climbing_node = self.min_node()
+		while climbing_node.parent is not None and key >= climbing_node.parent.key:
 			climbing_node = climbing_node.parent
 			upwards_path_counter += 1
-		result = list(AVLTree(climbing_node).insert(key, val))
-		if self.max_tree_node.key < key:
-			self.max_tree_node = result[0]
-		self.fix_root()
-		return (result[0], result[1] + upwards_path_counter, result[2])
-
-	"""deletes node from the dictionary
-
-	@type node: AVLNode
-	@pre: node is a real pointer to a node in self
-	"""
+		result = list(self.search_from(climbing_node, key))
+		result[1] = result[1] + upwards_path_counter
+		if self.stats is not None:
+			self.stats.record("min_finger_search", result[1])
+		return tuple(result)
 
-	def find_max(self):
+	def min_finger_insert(self, key=None, val=None):
 		"""
 		Input:
-			'self': AVLTree instace
+			'self': AVLTree instance
+			'key': int
+			'val': string
 		Output:
-			@type: AVLNode instance
-			returns the node with the maximum key in the tree
+			a 3-tuple (x,e,h) where x is the new node,
+			e is the number of edges on the path between the starting node and new node before rebalancing,
+			and h is the number of PROMOTE cases during the AVL rebalancing
 		Description:
-			Traverses right children from the root until a virtual node is reached.
-            Returns the last real node (the one with the greatest key).
+			inserts a new node into the dictionary with corresponding key and value, starting at the min.
+			Mirror image of finger_insert.
 		Time Complexity:
-			Overall O(log n) in a balanced AVL, as studied in class.
+			O(log d) to find the spot, where d is the number of keys smaller than key, plus the rebalancing.
 		"""
-		node = self.root
-		parent = node
-		while node is not None and node.is_real_node():
-			parent = node
-			node = node.right
-		return parent
-
-	def bst_deletion(self, node: AVLNode):
+		self.tree_size += 1
+		if not self.root.is_real_node():
+			self.create_root(key, val)
+			result = (self.root, 0, 0)
+		else:
+			upwards_path_counter = 0
+			climbing_node = self.min_tree_node
+			while climbing_node.parent is not None and key > climbing_node.parent.key:
+				climbing_node = climbing_node.parent
+				upwards_path_counter += 1
+			result = list(self.insert_from(climbing_node, key, val))
+			result = (result[0], result[1] + upwards_path_counter, result[2])
+		if self.stats is not None:
+			self.stats.record("min_finger_insert", result[1], result[2])
+		return result
+
+	def closer_to_min(self, key):
 		"""
 		Input:
-			'self': AVLTree instace
-			'node': AVLNode instance
+			'self': non-empty AVLTree instance
+			'key': int
 		Output:
-			@type: AVLNode instance
-			returns the new root of 'self'
+			@type: bool
+			True if key is at least as close to the min key as to the max key.
 		Description:
-			Performs a standard BST deletion for 'node' without rebalancing.
-			- If the node is a leaf, remove it directly.
-			- If the node has one child, link that child to node's parent.
-			- If the node has two children, find the successor and swap in place of the node.
-			Returns the (possibly updated) root after the BST removal.
+			Decides which finger auto_finger_search and auto_finger_insert start from,
+			by the key distance to both ends.
 		Time Complexity:
-			O(1) for linking and removing.
-			Overall Finding the successor is O(log n).
+			O(1).
+		"""
+		return key - self.min_tree_node.key <= self.max_tree_node.key - key
+
+	def auto_finger_search(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int
+		Output:
+			a tuple (x,e) as returned by finger_search.
+		Description:
+			Runs min_finger_search or finger_search, whichever finger is closer to key.
+		Time Complexity:
+			O(log d), where d is the number of keys between key and the closer end.
+		"""
+		if not self.root.is_real_node():
+			return None, 0
+		if self.closer_to_min(key):
+			return self.min_finger_search(key)
+		return self.finger_search(key)
+
+	def auto_finger_insert(self, key=None, val=None):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int
+			'val': string
+		Output:
+			a 3-tuple (x,e,h) as returned by finger_insert.
+		Description:
+			Runs min_finger_insert or finger_insert, whichever finger is closer to key.
+		Time Complexity:
+			O(log d) to find the spot, where d is the number of keys between key and the closer end,
+			plus the rebalancing.
+		"""
+		if self.root.is_real_node() and self.closer_to_min(key):
+			return self.min_finger_insert(key, val)
+		return self.finger_insert(key, val)
+
+	def upsert(self, key, val=""):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, possibly already in the dictionary
+			'val': string
+		Output:
+			a 3-tuple (x,e,h) as returned by insert, where x is the node of key, now holding val,
+			and h is None if key was already there (its value was replaced, nothing was inserted).
+		Description:
+			Inserts key, or replaces its value if it is present, with a single descent from the root:
+			locate stops either at the node of key or at the parent a new node gets, where link_leaf
+			attaches it in one step. Replaces search followed by insert, which descends twice.
+		Time Complexity:
+			O(log n).
+		"""
+		if not self.root.is_real_node():
+			self.create_root(key, val)
+			result = self.root, 0, 0
+		else:
+			node, parent, e = self.locate(self.root, key)
+			if node is not None:
+				self.set_value(node, val)
+				result = node, e + 1, None
+			else:
+				result = self.insert_below(parent, key, val, e)
+		if self.stats is not None:
+			self.stats.record("upsert", result[1], result[2] or 0)
+		return result
+
+	def get_or_insert(self, key, factory):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, possibly already in the dictionary
+			'factory': callable without arguments, returning the value of a new node
+		Output:
+			@type: AVLNode instance
+			the node of key: the existing one, or a new one holding factory(), inserted in the same descent.
+		Description:
+			factory is called only if key is missing.
+		Time Complexity:
+			O(log n).
+		"""
+		if not self.root.is_real_node():
+			self.create_root(key, factory())
+			node, edges = self.root, 0
+		else:
+			node, parent, e = self.locate(self.root, key)
+			if node is None:
+				node = self.insert_below(parent, key, factory(), e)[0]
+			edges = e + 1
+		if self.stats is not None:
+			self.stats.record("get_or_insert", edges)
+		return node
+
+	def insert_below(self, parent, key, val, e):
+		"""
+		Input:
+			'self': non-empty AVLTree instance
+			'parent': AVLNode instance, the node where locate stopped for the missing key
+			'key', 'val': the new item
+			'e': int, the edges locate descended to reach parent
+		Output:
+			a 3-tuple (x,e,h) as returned by insert.
+		Time Complexity:
+			O(1) amortized rebalancing plus the O(log n) size updates.
+		"""
+		self.tree_size += 1
+		new_node = self.node_class(key, val)
+		e += self.link_leaf(parent, new_node)
+		return new_node, e, self.complete_insertion(new_node)
+
+	def pop(self, key, default=None):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, possibly not in the dictionary
+			'default': what to return if key is not in the dictionary
+		Output:
+			the value of key, which is deleted from the dictionary; default if key was not there.
+		Description:
+			One descent to find the node; delete itself climbs from it and needs no second search.
+		Time Complexity:
+			O(log n).
+		"""
+		node = self.search_from(self.root, key)[0]
+		if node is None:
+			return default
+		self.delete(node)
+		return node.value
+
+	def set_value(self, node, val):
+		"""
+		Input:
+			'self': AVLTree instance
+			'node': AVLNode instance of self
+			'val': the new value
+		Output:
+			-
+		Description:
+			Replaces the value of node. Trees that keep summaries of their values override it
+			(see AugmentedAVLTree).
+		Time Complexity:
+			O(1).
+		"""
+		node.value = val
+
+	"""deletes node from the dictionary
+
+	@type node: AVLNode
+	@pre: node is a real pointer to a node in self
+	"""
+
+	def find_max(self):
+		"""
+		Input:
+			'self': AVLTree instace
+		Output:
+			@type: AVLNode instance
+			returns the node with the maximum key in the tree
+		Description:
+			Traverses right children from the root until a virtual node is reached.
+            Returns the last real node (the one with the greatest key).
+		Time Complexity:
+			Overall O(log n) in a balanced AVL, as studied in class.
+		"""
+		node = self.root
+		parent = node
+		while node is not None and node.is_real_node():
+			parent = node
+			node = node.right
+		return parent
+
+	def find_min(self):
+		"""
+		Input:
+			'self': AVLTree instace
+		Output:
+			@type: AVLNode instance
+			returns the node with the minimum key in the tree
+		Description:
+			Traverses left children from the root until a virtual node is reached.
+            Returns the last real node (the one with the smallest key).
+		Time Complexity:
+			Overall O(log n) in a balanced AVL.
+		"""
+		node = self.root
+		parent = node
+		while node is not None and node.is_real_node():
+			parent = node
+			node = node.left
+		return parent
+
+	def bst_deletion(self, node: AVLNode):
+		"""
+		Input:
+			'self': AVLTree instace
+			'node': AVLNode instance
+		Output:
+			@type: AVLNode instance
+			returns the lowest node whose subtree lost a node (None if the tree became empty or node was the root)
+		Description:
+			Performs a standard BST deletion for 'node' without rebalancing.
+			- If the node is a leaf, remove it directly.
+			- If the node has one child, link that child to node's parent.
+			- If the node has two children, find the successor and swap in place of the node.
+			Rebalancing has to start from the returned node: for a two-children node that is the
+			successor's former parent, which lies below the successor's new position.
+		Time Complexity:
+			O(1) for linking and removing.
+			Finding the successor is O(1) along its thread.
 		"""
 		# Identify the type of the node to be deleted
 		to_be_deleted_type = node.node_type()
@@ -752,6 +1432,7 @@ class AVLTree(object):
 			parent = node.parent
 			successor = node.successor()  # Find the successor (smallest node in the right subtree)
 			successor_parent = successor.parent
+			lowest_changed = successor if successor_parent == node else successor_parent
 
 			# Replace successor with its right child
 			if successor_parent.left == successor:
@@ -772,7 +1453,8 @@ class AVLTree(object):
 			# Update the successor's children
 			successor.update_left_child(node.left)
 			successor.update_right_child(node.right)
-		return self.root
+			return lowest_changed
+		return node.parent
 
 	def delete(self, node: AVLNode):
 		"""
@@ -786,30 +1468,57 @@ class AVLTree(object):
 			returns the new root of 'self'
 		Description:
 			Deletes 'node' from the AVLTree using bst_deletion for the raw removal,
-			then climbs up the ancestors to rebalance if needed (rotations).
-			Also updates the max_tree_node if the deleted node was the max.
+			then climbs up the ancestors to rebalance if needed (rotations) and to refresh subtree sizes.
+			Above node's former parent (bst_deletion already rewrote the heights up to there), the climb
+			stops at the first subtree whose height is unchanged, after a rotation or not; from there on
+			only the subtree sizes are updated.
+			node is unthreaded from its neighbours, and if it was the max (min), its predecessor
+			(successor) becomes the max_tree_node (min_tree_node).
 		Time Complexity:
 			bst_deletion costs O(log n)
-			O(log n) - removal is O(log n) plus rebalancing up the tree at most O(log n) steps.
-		"""
-		# Delete node from self as in a regular BST ; 'parent' refers to the node's parent
-		new_root = self.bst_deletion(node)
-		temp = node.parent
+			O(log n) - removal is O(log n) plus rebalancing up the tree at most O(log n) steps,
+			O(1) amortized of them once node's parent is passed.
+		"""
+		# Delete node from self as in a regular BST ; 'temp' is the lowest node whose subtree changed
+		former_parent = node.parent
+		temp = self.bst_deletion(node)
+		above_former_parent = False
+		steps = 0
+		height = temp.height if temp else None
 		while temp:  #Performing rotations if necessary
+			steps += 1
+			# A rotation below the parent rewrites its height, so it is read before rotating
+			parent = temp.get_parent()
+			parent_height = parent.height if parent else None
 			balance_factor = temp.get_balance_factor()
 			if abs(balance_factor) <= 1:  #valid balance factor
-				if temp.find_height() != temp.get_height():  #height has changed
-					temp.update_height()
-					temp = temp.get_parent()
-				else:  #height has not changed
-					temp = temp.get_parent()
+				temp.update_height()  # refreshes the subtree size even when the height has not changed
+				top = temp
 			else:  #Invalid balance factor - rotations are needed
 				self.rebalance_rotation(temp)
-				temp = temp.get_parent()
+				top = temp.get_parent()  # the root of the rotated subtree
+			if above_former_parent and top.height == height:
+				if parent and top is not temp:
+					parent.update_height()  # recomputed mid-rotation from a child height that later changed
+				temp = parent
+				break
+			above_former_parent = above_former_parent or temp is former_parent
+			temp, height = parent, parent_height
+		self.update_sizes_upwards(temp)
+		self.tree_size -= 1
+		if self.stats is not None:
+			self.stats.record("delete")
+			self.stats.rebalance_steps += steps
+		if node.prev is not None:
+			node.prev.next = node.next
+		if node.next is not None:
+			node.next.prev = node.prev
 		if node == self.max_tree_node:
-			print("here")
-			self.max_tree_node = self.find_max()
-		return new_root
+			self.max_tree_node = node.prev if self.root.is_real_node() else AVLNode.virtual_node
+		if node == self.min_tree_node:
+			self.min_tree_node = node.next if self.root.is_real_node() else AVLNode.virtual_node
+		node.prev = node.next = None
+		return self.root
 
 	"""joins self with item and another AVLTree
 
@@ -829,10 +1538,11 @@ class AVLTree(object):
 			self: AVLTree instance
 			node: AVLNode instance
 		Output:
-			returns the new tree's root after rebalancing
-			return type: AVLTree instance
+			returns the number of PROMOTE cases (height increments) during the rebalancing
+			return type: int
 		Description:
-			balances tree similarly to delete's rebalance methodology,
+			balances tree similarly to delete's rebalance methodology; the topmost node the climb
+			reaches becomes self.root, so no fix_root is needed.
 
 		Time Complexity:
 			O(log n).
@@ -842,20 +1552,20 @@ class AVLTree(object):
 			In the end, Rebalance using 'rebalance_rotation' method, which costs O(1).
 			Overall, the time complexity of join is O(log n).
 		"""
-		# Delete node from self as in a regular BST ; 'parent' refers to the node's parent
-		new_root = node
+		promotions = 0
 		temp = node
 		while temp:  #Performing rotations if necessary
 			balance_factor = temp.get_balance_factor()
 			if abs(balance_factor) <= 1:  #valid balance factor
-				if temp.find_height() != temp.get_height():  #height has changed
-					temp.update_height()
-			#else, height has not changed
+				if temp.height < temp.find_height():
+					promotions += 1
+				temp.update_height()  # refreshes the subtree size even when the height has not changed
 			else:  #Invalid balance factor - rotations are needed
 				self.rebalance_rotation(temp)
+			if temp.parent is None:
+				self.root = temp
 			temp = temp.get_parent()
-		self.fix_root()
-		return self.root
+		return promotions
 
 	def join(self, tree2, key, val=""):
 		"""
@@ -867,7 +1577,8 @@ class AVLTree(object):
 			'key': int
 			'val': string (optional)
 		Output:
-			-
+			@type: int
+			the number of PROMOTE cases during the rebalancing
 		Description:
 			It creates a node with the given key,val and merges the two trees into a single tree.
 			The steps(conceptually):
@@ -884,7 +1595,8 @@ class AVLTree(object):
 				- If one of the trees is empty, this effectively becomes an insertion of key into the non-empty tree.
 				- If both trees are empty, we just create a new root with (key, val).
 
-			After the join, tree2 becomes empty.
+			After the join, tree2 becomes empty, and self's max (min) node is the max (min) node of the tree
+			holding the larger (smaller) keys, x if that tree was empty.
 
 		Time Complexity:
 			O(log n).
@@ -897,29 +1609,90 @@ class AVLTree(object):
 			root = AVLNode(key, val)
 			self.root = AVLTree(root, root, 1)
 			return
-		elif tree2.root is None or not tree2.root.is_real_node():
-			if self.search(key)[0] is None:
-				self.insert(key, val)
-				print(key)
-			return
-		elif self.root is None or not self.root.is_real_node():
-			if tree2.search(key)[0] is None:
-				tree2.insert(key, val)
-			self.convert_tree(tree2)
-			return
+		return self.join_node(tree2, self.node_class(key, val))
+
+	def join_node(self, tree2, x: AVLNode, self_is_lower=None):
+		"""
+		Input:
+			'self', 'tree2': AVLTree instances, as in join
+			'x': AVLNode instance holding the separating key and value, not linked into any tree
+			'self_is_lower': bool, whether self's items come before x and tree2's after it;
+			None to compare the keys
+		Output:
+			@type: int
+			the number of PROMOTE cases during the rebalancing
+		Description:
+			The body of join, on a given node: split and concat pass the nodes they take out of a tree,
+			so those nodes are reused rather than copied.
+			x is threaded between the inner ends of the two trees: the max node of the tree holding the
+			smaller keys and the min node of the other one. They are read from max_tree_node and
+			min_tree_node, and found by a descent only if those are unset (as for the pieces of split_root).
+			Given self_is_lower, no key is compared: x goes at the end of a non-empty tree joined with
+			an empty one, rather than where a search for its key leads.
+		Time Complexity:
+			O(log n), as join.
+		"""
+		if self.stats is not None:
+			self.stats.record("join")
+		key = x.key
+		x.parent = None
+		x.left = x.right = AVLNode.virtual_node
+		x.height = 0
+		x.update_size()
+		self_is_real, tree2_is_real = self.root.key is not None, tree2.root.key is not None
+		by_key = self_is_lower is None
+		if by_key:
+			if self_is_real:
+				self_is_lower = self.root.key < key
+			else:
+				self_is_lower = not (tree2_is_real and tree2.root.key < key)
+		lower, higher = (self, tree2) if self_is_lower else (tree2, self)
+		prev_node = next_node = None
+		min_node = max_node = x
+		if lower.root.key is not None:
+			prev_node = lower.max_tree_node if lower.max_tree_node.key is not None else lower.find_max()
+			min_node = lower.min_tree_node
+		if higher.root.key is not None:
+			next_node = higher.min_tree_node if higher.min_tree_node.key is not None else higher.find_min()
+			max_node = higher.max_tree_node
+
+		if not (self_is_real and tree2_is_real):
+			if not self.root.is_real_node():
+				self.convert_tree(tree2)
+				tree2.create_root(None)
+			promotions = 0
+			if not self.root.is_real_node():
+				self.root = x
+			else:
+				if by_key:
+					found, parent, _ = self.locate(self.root, key)
+					if found is not None:
+						return promotions
+					self.link_leaf(parent, x)
+				elif prev_node is not None:
+					prev_node.right, x.parent = x, prev_node
+				else:
+					next_node.left, x.parent = x, next_node
+				promotions = self.insertion_rebalance(x.parent)
+			self.thread_between(prev_node, x, next_node)
+			self.min_tree_node, self.max_tree_node = min_node, max_node
+			self.tree_size = self.root.size
+			return promotions
 
 		# self is the highest after this block:
 		if self.root.height < tree2.root.height:
-			temp_vals = self.root, self.tree_size, self.max_tree_node
+			temp_vals = self.root, self.tree_size, self.max_tree_node, self.min_tree_node
 			self.convert_tree(tree2)
-			tree2.root, tree2.tree_size, tree2.max_tree_node = temp_vals
+			tree2.root, tree2.tree_size, tree2.max_tree_node, tree2.min_tree_node = temp_vals
+			self_is_lower = not self_is_lower
+		if self.stats is not None:
+			self.stats.join_height_differences[self.root.height - tree2.root.height] += 1
 		## Why does it go right side?
 		descending_node = self.root
-		x = AVLNode(key, val)
 		x.height = tree2.root.height
 
 		# Finding B and Attaching x
-		if self.root.key > tree2.root.key:
+		if not self_is_lower:
 			if abs(self.root.height - tree2.root.height) <= 1:
 				x.left = tree2.root  # x's left son is a
 				x.right = self.root  # x's right son is b
@@ -955,11 +1728,63 @@ class AVLTree(object):
 				x.parent = descending_node_parent  # c is x's parent
 				if descending_node.is_real_node():
 					descending_node.parent = x  # x is b's parent
-		# Understand why not +1 as well
-		self.tree_size = self.size() + tree2.size() + 1
-
+		x.prev, x.next = prev_node, next_node
+		prev_node.next = next_node.prev = x  # both trees are non-empty here
+		self.min_tree_node, self.max_tree_node = min_node, max_node
 		tree2.create_root(None)
-		self.root = self.rebalace_for_join(x)
+		promotions = self.rebalace_for_join(x)
+		self.tree_size = self.root.size
+		return promotions
+
+	def link_leaf(self, curr_node, new_node):
+		"""
+		Input:
+			'self': non-empty AVLTree instance
+			'curr_node': AVLNode instance, a real node whose subtree key range contains new_node.key
+			'new_node': AVLNode instance, a single node not linked into any tree
+		Output:
+			@type: int
+			the number of edges descended from curr_node to the parent of new_node.
+		Description:
+			Descends to the empty spot of new_node.key and makes new_node a child there,
+			without threading or rebalancing.
+		Time Complexity:
+			O(h) for the height h of curr_node.
+		"""
+		key = new_node.key
+		parent_node = None
+		e = 0  # path counter
+		# Binary search - find the correct spot
+		while curr_node.is_real_node():
+			parent_node = curr_node
+			if key < curr_node.key:
+				curr_node = curr_node.left
+			else:
+				curr_node = curr_node.right
+			e += 1
+		new_node.parent = parent_node
+		if key < parent_node.key:
+			parent_node.left = new_node
+		else:
+			parent_node.right = new_node
+		return e
+
+	@staticmethod
+	def thread_between(prev_node, node, next_node):
+		"""
+		Input:
+			'prev_node', 'next_node': AVLNode instances or None, the in-order neighbours 'node' gets
+			'node': AVLNode instance
+		Output:
+			-
+		Time Complexity:
+			O(1).
+		"""
+		node.prev, node.next = prev_node, next_node
+		if prev_node is not None:
+			prev_node.next = node
+		if next_node is not None:
+			next_node.prev = node
 
 	def split(self, node: AVLNode):
 		"""
@@ -976,6 +1801,7 @@ class AVLTree(object):
 		Description:
 			Splits the AVL tree into two AVL trees, 'l_side' and 'r_side', around 'node'.
 			The keys < node.key will be in l_side; the keys > node.key will be in r_side.
+			Both sides get their size from the subtree size of their root, and their max and min nodes.
 			steps:
 				1. Initialize l_side, r_side
 				2. "Remove" 'node' from the chain by ascending to its parent
@@ -989,20 +1815,550 @@ class AVLTree(object):
 			In the end, Rebalance using delete's rebalance method, which costs O(logn).
 			Overall, the time complexity of join is O(log n).
 		"""
-		curr_node = node
-		l_side, r_side = AVLTree(curr_node.left), AVLTree(curr_node.right)
-		curr_node = curr_node.parent
-		# Find node's successor
+		l_side, r_side = self.make_tree(node.left), self.make_tree(node.right)
+		l_side.root.parent = r_side.root.parent = None
+		return self.split_upwards(node.parent, node.key, l_side, r_side, node)
+
+	def split_upwards(self, curr_node, key, l_side, r_side, below=None):
+		"""
+		Input:
+			'curr_node': AVLNode instance or None, the lowest ancestor not yet distributed
+			'key': int, the key to split by
+			'l_side', 'r_side': AVLTree instances holding the detached pieces below curr_node
+			'below': AVLNode instance, the child of curr_node the split comes from, or None
+		Output:
+			@type: (AVLTree, AVLTree)
+			'l_side' and 'r_side' once every ancestor up to the root was joined into them.
+		Description:
+			Climbs from curr_node to the root; each ancestor is joined, together with its subtree on
+			the far side from key, into l_side if its key is smaller than key and into r_side otherwise.
+			Past the first step (from the start, given below), the side is told by the child the climb
+			comes from instead of by comparing keys, so it works on implicit orders too (see RopeAVLTree).
+			The ancestors themselves are reused as the separating nodes of the joins (see join_node).
+			Both sides get their size from the subtree size of their root, and their max and min nodes.
+		Time Complexity:
+			O(log n), the joins along the path telescope.
+		"""
+		pieces = 0
 		while curr_node is not None:
-			left, right = AVLTree(curr_node.left), AVLTree(curr_node.right)
-			left.root.parent = right.root.parent = None
-			if curr_node.key < node.key:
-				l_side.join(left, curr_node.key, node.value)
+			parent = curr_node.parent
+			# Only the subtree on the far side is detached: the other one is already part of a side
+			# curr_node's threads still lead to the inner ends of both pieces it is joined with
+			if curr_node.key < key if below is None else curr_node.right is below:
+				left = self.make_tree(curr_node.left)
+				left.root.parent = None
+				if left.root.is_real_node():
+					left.max_tree_node = curr_node.prev
+				if l_side.root.is_real_node():
+					l_side.min_tree_node = curr_node.next
+				l_side.join_node(left, curr_node, False)
 			else:
-				r_side.join(right, curr_node.key, node.value)
-			curr_node = curr_node.parent
+				right = self.make_tree(curr_node.right)
+				right.root.parent = None
+				if right.root.is_real_node():
+					right.min_tree_node = curr_node.next
+				if r_side.root.is_real_node():
+					r_side.max_tree_node = curr_node.prev
+				r_side.join_node(right, curr_node, True)
+			below, curr_node = curr_node, parent
+			pieces += 1
+		if self.stats is not None:
+			self.stats.record("split")
+			self.stats.split_pieces[pieces] += 1
+		for side in (l_side, r_side):
+			side.tree_size = side.root.size
+			side.max_tree_node = side.find_max()
+			side.min_tree_node = side.find_min()
+			if side.root.is_real_node():
+				# Cut the threads leading across the split
+				side.max_tree_node.next = side.min_tree_node.prev = None
 		return l_side, r_side
 
+	def split_by_key(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: (AVLTree, AVLNode, AVLTree)
+			a tuple (left, x, right) where left holds the keys smaller than key, right the keys larger
+			than key, and x is the node of key (None if key is not in self).
+		Description:
+			Like split, but takes a key: descends from the root to key and, if it is absent, splits
+			upwards from the last real node of the search path. self must not be used afterwards.
+		Time Complexity:
+			O(log n).
+		"""
+		node = self.root
+		last = None
+		while node.is_real_node():
+			if key == node.key:
+				left, right = self.split(node)
+				return left, node, right
+			last = node
+			node = node.left if key < node.key else node.right
+		left, right = self.split_upwards(last, key, self.make_tree(), self.make_tree())
+		return left, None, right
+
+	def split_root(self):
+		"""
+		Input:
+			'self': AVLTree instance, not empty
+		Output:
+			@type: (AVLTree, AVLNode, AVLTree)
+			self's left subtree, root and right subtree, detached from each other.
+		Description:
+			The subtrees keep their nodes; only their parent links to the root are cut.
+			Their max and min nodes come from the root's threads and from self's own (unset if self's are).
+			Their outer threads still lead past their ends. self must not be used afterwards.
+		Time Complexity:
+			O(1).
+		"""
+		root = self.root
+		left, right = self.make_tree(root.left, root.left.size), self.make_tree(root.right, root.right.size)
+		left.root.parent = right.root.parent = None
+		if left.root.is_real_node():
+			left.min_tree_node, left.max_tree_node = self.min_tree_node, root.prev
+		if right.root.is_real_node():
+			right.min_tree_node, right.max_tree_node = root.next, self.max_tree_node
+		return left, root, right
+
+	def concat(self, tree2):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance whose keys are either all smaller or all larger than self's keys
+		Output:
+			@type: int
+			the number of PROMOTE cases during the join.
+		Description:
+			Joins self and tree2 without a separating key: the max node of the tree holding the smaller
+			keys is deleted from it and used as the separating node of a join.
+			After the concat, tree2 becomes empty.
+		Time Complexity:
+			O(log n).
+		"""
+		if not tree2.root.is_real_node():
+			return 0
+		if not self.root.is_real_node():
+			self.convert_tree(tree2)
+			tree2.create_root(None)
+			return 0
+		lower = self if self.root.key < tree2.root.key else tree2
+		separator = lower.max_tree_node if lower.max_tree_node.is_real_node() else lower.find_max()
+		separator.next = None  # may lead into tree2 when lower is a piece of a split
+		lower.delete(separator)
+		return self.join_node(tree2, separator)
+
+	@staticmethod
+	def set_operation_trees(tree1, tree2, operation):
+		"""
+		Input:
+			'tree1', 'tree2': AVLTree instances
+			'operation': string, one of "union", "intersection", "difference", "symmetric_difference"
+		Output:
+			@type: (AVLTree, int)
+			the tree holding the result of the operation, and the number of PROMOTE cases of its joins.
+		Description:
+			Splits the larger tree by the key of the smaller tree's root, applies the operation to the
+			two left and the two right parts recursively, and joins the results around the root's key
+			if the operation keeps that key (concatenates them otherwise), so the recursion follows the
+			structure of the smaller tree.
+			Values: union keeps tree2's value for keys in both trees, intersection keeps tree1's,
+			"difference" is tree1 minus tree2.
+			Both input trees are consumed. The max node of the result is not maintained.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		if not tree1.root.is_real_node():
+			return (tree1 if operation in ("intersection", "difference") else tree2), 0
+		if not tree2.root.is_real_node():
+			return (tree2 if operation == "intersection" else tree1), 0
+		pivot_from_tree1 = tree1.root.size < tree2.root.size
+		if pivot_from_tree1:
+			left1, pivot, right1 = tree1.split_root()
+			left2, found, right2 = tree2.split_by_key(pivot.key)
+		else:
+			left2, pivot, right2 = tree2.split_root()
+			left1, found, right1 = tree1.split_by_key(pivot.key)
+		if operation == "union":
+			keep = True
+			val = found.value if pivot_from_tree1 and found is not None else pivot.value
+		elif operation == "intersection":
+			keep = found is not None
+			val = pivot.value if pivot_from_tree1 or not keep else found.value
+		elif operation == "difference":
+			keep = pivot_from_tree1 and found is None
+			val = pivot.value
+		else:
+			keep = found is None
+			val = pivot.value
+		left, left_promotions = AVLTree.set_operation_trees(left1, left2, operation)
+		right, right_promotions = AVLTree.set_operation_trees(right1, right2, operation)
+		if keep:
+			promotions = left.join(right, pivot.key, val)
+		else:
+			promotions = left.concat(right)
+		return left, left_promotions + right_promotions + promotions
+
+	def to_columns(self):
+		"""
+		Input:
+			'self': AVLTree instance
+		Output:
+			a tuple (keys, values) of two lists in increasing key order
+		Description:
+			The column form dump writes; AVLTree.from_sorted(zip(keys, values)) rebuilds the tree.
+		Time Complexity:
+			O(n).
+		"""
+		keys, values = [], []
+		for key, val in self.items():
+			keys.append(key)
+			values.append(val)
+		return keys, values
+
+	def apply_set_operation(self, tree2, operation):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance
+			'operation': string, as in set_operation_trees
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			Turns self into the result of set_operation_trees(self, tree2, operation)
+			and empties tree2.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		result, promotions = AVLTree.set_operation_trees(self, tree2, operation)
+		self.convert_tree(result)
+		self.tree_size = self.root.size
+		self.max_tree_node = self.find_max()
+		self.min_tree_node = self.find_min()
+		if self.root.is_real_node():
+			# The ends may still be threaded to nodes the operation dropped
+			self.max_tree_node.next = self.min_tree_node.prev = None
+		if tree2 is not self:
+			tree2.create_root(None)
+		return promotions
+
+	def union(self, tree2):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			Turns self into the union of self and tree2; for a key in both trees
+			the value of tree2 is kept. After the union, tree2 becomes empty.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		return self.apply_set_operation(tree2, "union")
+
+	def intersection(self, tree2):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			Turns self into the keys that are in both self and tree2, with self's values.
+			After the intersection, tree2 becomes empty.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		return self.apply_set_operation(tree2, "intersection")
+
+	def difference(self, tree2):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			Removes from self every key that is in tree2. After the difference, tree2 becomes empty.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		return self.apply_set_operation(tree2, "difference")
+
+	def symmetric_difference(self, tree2):
+		"""
+		Input:
+			'self': AVLTree instance
+			'tree2': AVLTree instance
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			Turns self into the keys that are in exactly one of self and tree2, each with the value
+			of the tree holding it. After the symmetric difference, tree2 becomes empty.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		return self.apply_set_operation(tree2, "symmetric_difference")
+
+	def insert_many(self, items):
+		"""
+		Input:
+			'self': AVLTree instance
+			'items': iterable of (key, value) tuples in any order; keys may already be in self
+		Output:
+			a tuple (k,h) where k is the number of keys that were not in self before,
+			and h is the number of PROMOTE cases while merging the batch in.
+		Description:
+			Sorts the batch, builds a balanced tree of self's node class from it and merges it into self
+			with union. For keys repeated in the batch the last value wins, and batch values replace
+			the values of keys already in self.
+		Time Complexity:
+			O(k log k) to sort the batch plus O(k log(n/k + 1)) to merge it.
+		"""
+		batch = {}
+		for key, val in items:
+			batch[key] = val
+		batch_tree = self.make_tree().build_from_sorted(sorted(batch.items()))
+		size_before = self.tree_size
+		promotions = self.union(batch_tree)
+		return self.tree_size - size_before, promotions
+
+	"""returns the rank of a key in the dictionary
+
+	@type key: int
+	@rtype: int
+	@returns: the number of keys in the dictionary smaller than key
+	"""
+
+	def rank(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: int
+			The number of keys in self smaller than 'key'.
+		Description:
+			Descends from the root towards key; whenever the path turns right,
+			the node and its whole left subtree are smaller than key.
+		Time Complexity:
+			O(log n).
+		"""
+		smaller = 0
+		node = self.root
+		while node.is_real_node():
+			if key <= node.key:
+				node = node.left
+			else:
+				smaller += node.left.size + 1
+				node = node.right
+		return smaller
+
+	def select(self, index):
+		"""
+		Input:
+			'self': AVLTree instance
+			'index': int, 0 <= index < self.size()
+		Output:
+			@type: AVLNode instance
+			The node with exactly 'index' smaller keys in self, i.e. select(rank(key)) is the node of key.
+		Description:
+			Descends from the root comparing index with the size of the left subtree.
+			Raises IndexError if index is out of range.
+		Time Complexity:
+			O(log n).
+		"""
+		if not 0 <= index < self.root.size:
+			raise IndexError("select index %d out of range for a tree of size %d" % (index, self.root.size))
+		node = self.root
+		while True:
+			left_size = node.left.size
+			if index < left_size:
+				node = node.left
+			elif index == left_size:
+				return node
+			else:
+				index -= left_size + 1
+				node = node.right
+
+	def count_range(self, lo, hi):
+		"""
+		Input:
+			'self': AVLTree instance
+			'lo', 'hi': int, the bounds of the half-open key range [lo, hi)
+		Output:
+			@type: int
+			The number of keys k in self with lo <= k < hi.
+		Time Complexity:
+			O(log n), two rank computations.
+		"""
+		if hi <= lo:
+			return 0
+		return self.rank(hi) - self.rank(lo)
+
+	def ceiling_node(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: AVLNode instance
+			The node with the smallest key >= 'key', a virtual node if there is none.
+		Time Complexity:
+			O(log n).
+		"""
+		candidate = AVLNode.virtual_node
+		node = self.root
+		while node.is_real_node():
+			if key <= node.key:
+				candidate = node
+				node = node.left
+			else:
+				node = node.right
+		return candidate
+
+	def lower_node(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: AVLNode instance
+			The node with the largest key < 'key', a virtual node if there is none.
+		Time Complexity:
+			O(log n).
+		"""
+		candidate = AVLNode.virtual_node
+		node = self.root
+		while node.is_real_node():
+			if node.key < key:
+				candidate = node
+				node = node.right
+			else:
+				node = node.left
+		return candidate
+
+	def higher_node(self, key):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: AVLNode instance
+			The node with the smallest key > 'key', a virtual node if there is none.
+		Time Complexity:
+			O(log n).
+		"""
+		candidate = AVLNode.virtual_node
+		node = self.root
+		while node.is_real_node():
+			if key < node.key:
+				candidate = node
+				node = node.left
+			else:
+				node = node.right
+		return candidate
+
+	def cursor(self, key=None):
+		"""
+		Input:
+			'self': AVLTree instance
+			'key': int or None
+		Output:
+			@type: Cursor instance
+			A cursor at the node with the smallest key >= 'key', at the min node if key is None.
+		Time Complexity:
+			O(log n).
+		"""
+		cursor = Cursor(self)
+		if key is not None:
+			cursor.seek(key)
+		return cursor
+
+	def range(self, lo, hi, reverse=False):
+		"""
+		Input:
+			'self': AVLTree instance
+			'lo', 'hi': int, the bounds of the half-open key range [lo, hi)
+			'reverse': bool, whether to walk the range from the largest key down
+		Output:
+			a generator of the (key, value) tuples with lo <= key < hi, in increasing key order
+			(decreasing if reverse)
+		Description:
+			Descends once to the first node of the range (ceiling_node of lo, or lower_node of hi when
+			reversed) and then steps lazily along the threads, stopping at the first key
+			outside the range. The tree must not be modified while the generator is consumed.
+		Time Complexity:
+			O(log n + k) for k yielded items, each step is O(1).
+		"""
+		if reverse:
+			node = self.lower_node(hi)
+			if not node.is_real_node():
+				return
+			while node is not None and lo <= node.key:
+				yield node.key, node.value
+				node = node.prev
+		else:
+			node = self.ceiling_node(lo)
+			if not node.is_real_node():
+				return
+			while node is not None and node.key < hi:
+				yield node.key, node.value
+				node = node.next
+
+	def items(self):
+		"""
+		Input:
+			'self' is the tree we traverse
+		Output:
+			a generator of (key, value) tuples in increasing key order
+		Description:
+			Lazy inorder traversal along the 'next' threads, from the leftmost node.
+			It takes exactly size steps, so it also works on the pieces of a split or a set operation,
+			whose outer threads may lead past their ends.
+		Time Complexity:
+			O(log n) to find the leftmost node, then O(1) per step and O(1) memory.
+		"""
+		node = self.find_min()
+		for _ in range(self.root.size):
+			yield node.key, node.value
+			node = node.next
+
+	def keys(self):
+		"""
+		Input:
+			'self' is the tree we traverse
+		Output:
+			a generator of the keys in increasing order
+		Time Complexity:
+			O(1) per step, as items().
+		"""
+		for key, _ in self.items():
+			yield key
+
+	def values(self):
+		"""
+		Input:
+			'self' is the tree we traverse
+		Output:
+			a generator of the values in increasing key order
+		Time Complexity:
+			O(1) per step, as items().
+		"""
+		for _, val in self.items():
+			yield val
+
+	def __iter__(self):
+		return self.keys()
+
 	"""returns an array representing dictionary 
 
 	@rtype: list
@@ -1016,14 +2372,99 @@ class AVLTree(object):
 		Output:
 			a sorted list according to key of tuples (key, value) representing the data structure
 		Description:
-			inorder traversal, costs O(n) as learned in class
+			materializes the lazy inorder traversal of items()
 		Time Complexity:
 			O(n)
 		"""
-		if self.root.is_real_node():
-			return AVLTree(self.root.left).avl_to_array() + [(self.root.key, self.root.value)] + AVLTree(
-				self.root.right).avl_to_array()
-		return []
+		return list(self.items())
+
+	def dump(self, path):
+		"""
+		Input:
+			'self': AVLTree instance with int keys and string (or None) values
+			'path': the file to write
+		Output:
+			-
+		Description:
+			Writes a binary snapshot that load reads back. After the SNAPSHOT_HEADER come, all little-endian:
+				1. the first key as an int64,
+				2. the gaps between consecutive keys, in the narrowest unsigned array typecode that holds them,
+				3. the length of every value in characters as int64, -1 for None,
+				4. all values concatenated, utf-8 encoded.
+			Raises ValueError if the keys do not fit in an int64.
+		Time Complexity:
+			O(n).
+		"""
+		keys, values = self.to_columns()
+		if keys and not ((-1 << 63) <= keys[0] and keys[-1] < 1 << 63):
+			raise ValueError("snapshot keys must fit in an int64")
+		deltas = [b - a for a, b in zip(keys, keys[1:])]
+		max_delta = max(deltas, default=0)
+		typecode = next(code for code in "BHIQ" if max_delta < 1 << (8 * array(code).itemsize))
+		lengths = array("q", (-1 if val is None else len(val) for val in values))
+		columns = [array("q", keys[:1]), array(typecode, deltas), lengths]
+		if sys.byteorder == "big":
+			for column in columns:
+				column.byteswap()
+		with open(path, "wb") as f:
+			f.write(self.SNAPSHOT_HEADER.pack(self.SNAPSHOT_MAGIC, self.SNAPSHOT_VERSION, typecode.encode(), len(keys)))
+			for column in columns:
+				column.tofile(f)
+			f.write("".join(val for val in values if val is not None).encode("utf-8"))
+
+	@classmethod
+	def load(cls, path):
+		"""
+		Input:
+			'path': a file written by dump
+		Output:
+			@type: AVLTree instance
+			A perfectly balanced tree holding the dumped items.
+		Description:
+			Maps the file into memory and reads the columns straight out of the mapping: the keys are
+			the running sums of the gaps, and the value blob is decoded once and sliced by the lengths.
+			The tree is then built bottom-up with from_sorted, without any insert.
+			Raises ValueError if the file is not a snapshot, or is shorter than its header says.
+		Time Complexity:
+			O(n).
+		"""
+		with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+			with memoryview(mapped) as view:
+				if len(view) < cls.SNAPSHOT_HEADER.size:
+					raise ValueError("%s is not an AVLTree snapshot" % path)
+				magic, version, typecode, count = cls.SNAPSHOT_HEADER.unpack_from(view)
+				if magic != cls.SNAPSHOT_MAGIC or version != cls.SNAPSHOT_VERSION:
+					raise ValueError("%s is not an AVLTree snapshot" % path)
+				sections = [(array(code), length) for code, length in
+							(("q", min(count, 1)), (typecode.decode(), max(count - 1, 0)), ("q", count))]
+				offset = cls.SNAPSHOT_HEADER.size
+				if len(view) < offset + sum(length * column.itemsize for column, length in sections):
+					raise ValueError("truncated snapshot")
+				columns = []
+				for column, length in sections:
+					end = offset + length * column.itemsize
+					column.frombytes(view[offset:end])
+					if sys.byteorder == "big":
+						column.byteswap()
+					columns.append(column)
+					offset = end
+				try:
+					blob = str(view[offset:], "utf-8")
+				except UnicodeDecodeError:
+					raise ValueError("truncated snapshot") from None
+		first, deltas, lengths = columns
+		keys = accumulate(deltas, initial=first[0]) if count else ()
+		values = []
+		position = 0
+		for length in lengths:
+			if length < 0:
+				values.append(None)
+			else:
+				values.append(blob[position:position + length])
+				position += length
+		if position != len(blob):
+			raise ValueError("truncated snapshot")
+		return cls.from_sorted(zip(keys, values))
 
 	"""returns the node with the maximal key in the dictionary
 
@@ -1046,6 +2487,21 @@ class AVLTree(object):
 		"""
 		return self.max_tree_node
 
+	def min_node(self):
+		"""
+		Input:
+			@type: AVLTree
+			'self' is the tree we traverse
+		Output:
+			@type: AVLNode
+			The minimal node of 'self'.
+		Description:
+			returns the smallest node of 'self'
+		Time Complexity:
+			O(1).
+		"""
+		return self.min_tree_node
+
 	"""returns the number of items in dictionary 
 
 	@rtype: int
@@ -1089,3 +2545,188 @@ class AVLTree(object):
 		if self.root.is_real_node():
 			return self.root
 		return None
+
+
+class Cursor(object):
+	"""
+	A movable position in an AVLTree, anchored at one of its nodes.
+	Fields:
+		'tree': AVLTree instance the cursor walks
+		'node': AVLNode instance the cursor stands on, a virtual node when it is off either end
+		'key': int or None, the key of the last node the cursor stood on
+		'side': int, when off the ends: -1 before the min, 1 after the max
+	Moves climb from the current node only as far as needed, like finger_search does from the max.
+	Nodes stay in place through insert and delete (rotations only relink them), so the cursor survives
+	updates anywhere in the tree; if its own node is deleted, the next move re-seeks from 'key'.
+	split, join and the set operations rebuild the tree; seek again after them.
+	"""
+
+	def __init__(self, tree, node=None):
+		"""
+		Input:
+			'tree': AVLTree instance
+			'node': AVLNode instance of tree, the min node if None
+		Output:
+			-
+		Description:
+			Constructor for Cursor.
+		Time Complexity:
+			O(1).
+		"""
+		self.tree = tree
+		self.node = tree.min_node() if node is None else node
+		self.key = self.node.key if self.node.is_real_node() else None
+		self.side = -1
+
+	def is_attached(self):
+		"""
+		Input:
+			'self': Cursor instance
+		Output:
+			@type: bool
+			True if the cursor stands on a node that is still linked into the tree.
+		Description:
+			A deleted node is no longer a child of its former parent, nor the root.
+		Time Complexity:
+			O(1).
+		"""
+		node = self.node
+		if not node.is_real_node():
+			return False
+		if node.parent is None:
+			return node is self.tree.root
+		return node.parent.left is node or node.parent.right is node
+
+	def land(self, node, side):
+		"""
+		Input:
+			'self': Cursor instance
+			'node': AVLNode instance, a virtual node to fall off the end given by 'side'
+			'side': int, -1 or 1
+		Output:
+			@type: AVLNode instance
+			'node'
+		Description:
+			Moves the cursor to node and remembers its key.
+		Time Complexity:
+			O(1).
+		"""
+		self.node = node
+		if node.is_real_node():
+			self.key = node.key
+		else:
+			self.key = None
+			self.side = side
+		return node
+
+	def seek(self, key):
+		"""
+		Input:
+			'self': Cursor instance
+			'key': int, not necessarily in the tree
+		Output:
+			@type: AVLNode instance
+			The node with the smallest key >= 'key' the cursor moved to, a virtual node if there is none.
+		Description:
+			Climbs from the current node with climb_towards until key is within the subtree's key range,
+			then descends towards key. If the search falls off the tree at a node with a smaller key,
+			the answer is that node's successor.
+		Time Complexity:
+			O(log d), where d is the number of keys between the current position and key.
+		"""
+		if self.is_attached():
+			node = self.tree.climb_towards(self.node, key)[0]
+		else:
+			node = self.tree.root
+		if not node.is_real_node():
+			return self.land(node, 1)
+		while node.key != key:
+			child = node.left if key < node.key else node.right
+			if not child.is_real_node():
+				break
+			node = child
+		if node.key < key:
+			node = node.successor()
+		return self.land(node, 1)
+
+	def advance(self, d=1):
+		"""
+		Input:
+			'self': Cursor instance
+			'd': int, the number of positions to move, backwards if negative
+		Output:
+			@type: AVLNode instance
+			The node d positions away, a virtual node if that runs off an end of the tree.
+		Description:
+			Climbs from the current node until the target rank falls within the subtree, using subtree
+			sizes to translate the offset into a rank inside the subtree, then descends as select does.
+			From a deleted node or off an end, the first step re-seeks from the remembered key.
+		Time Complexity:
+			O(log d).
+		"""
+		if not self.is_attached():
+			if d == 0:
+				return self.node if self.key is None else self.seek(self.key)
+			if self.key is None:
+				if d * self.side > 0:
+					return self.node
+				start = self.tree.min_node() if d > 0 else self.tree.max_node()
+			elif d > 0:
+				start = self.tree.higher_node(self.key)
+			else:
+				start = self.tree.lower_node(self.key)
+			side = 1 if d > 0 else -1
+			d -= side
+			self.land(start, side)
+			if not start.is_real_node() or d == 0:
+				return start
+		node = self.node
+		target = node.left.size + d
+		while not 0 <= target < node.size:
+			parent = node.parent
+			if parent is None:
+				return self.land(AVLNode.virtual_node, 1 if d > 0 else -1)
+			if parent.right is node:
+				target += parent.left.size + 1
+			node = parent
+		while True:
+			left_size = node.left.size
+			if target < left_size:
+				node = node.left
+			elif target == left_size:
+				return self.land(node, 1)
+			else:
+				target -= left_size + 1
+				node = node.right
+
+	def next(self):
+		"""
+		Input:
+			'self': Cursor instance
+		Output:
+			@type: AVLNode instance
+			The node with the next larger key, a virtual node past the max.
+		Description:
+			Follows the node's thread; from a deleted node or off an end, falls back to advance(1).
+		Time Complexity:
+			O(1).
+		"""
+		if self.is_attached():
+			return self.land(self.node.successor(), 1)
+		return self.advance(1)
+
+	def prev(self):
+		"""
+		Input:
+			'self': Cursor instance
+		Output:
+			@type: AVLNode instance
+			The node with the next smaller key, a virtual node before the min.
+		Description:
+			Mirror image of next.
+		Time Complexity:
+			O(1).
+		"""
+		if self.is_attached():
+			return self.land(self.node.predecessor(), -1)
+		return self.advance(-1)
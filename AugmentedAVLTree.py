@@ -0,0 +1,234 @@
+"""An AVLTree maintaining a user-supplied monoid over every subtree, for O(log n) range aggregates"""
+
+import math
+import operator
+
+from src.AVLTree import AVLNode, AVLTree
+
+
+class Monoid(object):
+	"""
+    Fields:
+        'combine': function of two summaries returning their summary, associative
+        'identity': the summary of no item, combine(identity, s) == combine(s, identity) == s
+        'measure': function from a node's value to its summary, None for the value itself
+        'node_class': the AugmentedAVLNode subclass bound to this monoid
+    Output:
+        -
+    Description:
+        What an AugmentedAVLTree keeps per subtree. combine need not be commutative: summaries are
+        always combined in key order. Each monoid gets a node class of its own, so nodes reach it
+        through their class and carry no reference to it.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+
+	def __init__(self, combine, identity, measure=None):
+		self.combine = combine
+		self.identity = identity
+		self.measure = measure
+		self.node_class = type("AugmentedAVLNode", (AugmentedAVLNode,), {"__slots__": (), "monoid": self})
+
+	def summarize(self, value):
+		return value if self.measure is None else self.measure(value)
+
+
+class AugmentedAVLNode(AVLNode):
+	"""
+    Fields:
+        'aggregate': the combined summary of the values in the subtree rooted at the node, in key order
+    Output:
+        -
+    Description:
+        An AVLNode whose update_size also recomputes 'aggregate' from the children. Rotations, the
+        rebalancing climbs, join, split and the bulk builds all go through update_size, so the
+        aggregate is maintained wherever the subtree size is. Instantiated through Monoid.node_class.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	__slots__ = ("aggregate",)
+	monoid = None
+
+	def __init__(self, key=None, value=None, parent=None):
+		super().__init__(key, value, parent)
+		self.aggregate = self.monoid.summarize(value) if key is not None else self.monoid.identity
+
+	def update_size(self):
+		"""
+		Input:
+			self - a real node
+		Output: -
+		Description:
+			update the subtree size and the aggregate of node using its children
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		AVLNode.update_size(self)
+		left, right = self.left, self.right
+		monoid = self.monoid
+		aggregate = monoid.summarize(self.value)
+		if left.key is not None:
+			aggregate = monoid.combine(left.aggregate, aggregate)
+		if right.key is not None:
+			aggregate = monoid.combine(aggregate, right.aggregate)
+		self.aggregate = aggregate
+
+
+SUM = Monoid(operator.add, 0)
+MIN = Monoid(min, math.inf)
+MAX = Monoid(max, -math.inf)
+
+
+class AugmentedAVLTree(AVLTree):
+	"""
+    Fields:
+        'monoid': Monoid instance maintained over every subtree, the class's default_monoid (SUM) if not given
+    Output:
+        -
+    Description:
+        An AVLTree whose nodes carry the monoid summary of their subtree, kept up to date through insert,
+        delete, the rotations, join, split, the set operations and from_sorted.
+        aggregate(lo, hi) combines the values of a key range in O(log n). Values must only change
+        through set_value, which refreshes the summaries above the node.
+        Trees combined by join or the set operations must share the same monoid.
+
+    Time Complexity:
+        Every update costs O(1) combine calls per node whose size it refreshes.
+    """
+
+	# The monoid of trees created without one; subclasses dedicated to one monoid override it
+	default_monoid = SUM
+
+	def __init__(self, root: AVLNode = AVLNode.virtual_node, max_tree_node: AVLNode = AVLNode.virtual_node,
+				 size: int = 0, min_tree_node: AVLNode = AVLNode.virtual_node, monoid: Monoid = None):
+		super().__init__(root, max_tree_node, size, min_tree_node)
+		self.monoid = self.default_monoid if monoid is None else monoid
+		self.node_class = self.monoid.node_class
+
+	@classmethod
+	def from_sorted(cls, iterable, monoid=None):
+		"""
+		Input:
+			'iterable': as in AVLTree.from_sorted
+			'monoid': Monoid instance, None for the class's default_monoid
+		Output:
+			@type: AugmentedAVLTree instance
+			A perfectly balanced tree holding the given items, with their summaries.
+		Time Complexity:
+			O(n).
+		"""
+		return cls(monoid=monoid).build_from_sorted(iterable)
+
+	def make_tree(self, root=AVLNode.virtual_node, size=0):
+		tree = type(self)(root, size=size, monoid=self.monoid)
+		tree.stats = self.stats
+		return tree
+
+	def set_value(self, node, val):
+		"""
+		Input:
+			'self': AugmentedAVLTree instance
+			'node': AVLNode instance of self
+			'val': the new value
+		Output:
+			-
+		Description:
+			Replaces the value of node and recomputes the summaries of node and its ancestors.
+		Time Complexity:
+			O(log n).
+		"""
+		node.value = val
+		self.update_sizes_upwards(node)
+
+	def aggregate_from(self, node, lo):
+		"""
+		Input:
+			'node': AVLNode instance, the root of a subtree
+			'lo': int
+		Output:
+			the combined summary of the values in node's subtree whose keys are >= lo.
+		Description:
+			Descends towards lo; whenever the path turns left, the node and its right subtree are in
+			the range, and are combined in front of what was collected above them.
+		Time Complexity:
+			O(log n).
+		"""
+		monoid = self.monoid
+		combine = monoid.combine
+		result = monoid.identity
+		while node.key is not None:
+			if lo <= node.key:
+				part = monoid.summarize(node.value)
+				if node.right.key is not None:
+					part = combine(part, node.right.aggregate)
+				result = combine(part, result)
+				node = node.left
+			else:
+				node = node.right
+		return result
+
+	def aggregate_below(self, node, hi):
+		"""
+		Input:
+			'node': AVLNode instance, the root of a subtree
+			'hi': int
+		Output:
+			the combined summary of the values in node's subtree whose keys are < hi.
+		Description:
+			Mirror image of aggregate_from.
+		Time Complexity:
+			O(log n).
+		"""
+		monoid = self.monoid
+		combine = monoid.combine
+		result = monoid.identity
+		while node.key is not None:
+			if node.key < hi:
+				part = monoid.summarize(node.value)
+				if node.left.key is not None:
+					part = combine(node.left.aggregate, part)
+				result = combine(result, part)
+				node = node.right
+			else:
+				node = node.left
+		return result
+
+	def aggregate(self, lo=None, hi=None):
+		"""
+		Input:
+			'self': AugmentedAVLTree instance
+			'lo', 'hi': int or None, the bounds of the half-open key range [lo, hi), None for no bound
+		Output:
+			the combined summary of the values with lo <= key < hi, in key order;
+			the monoid's identity if the range is empty.
+		Description:
+			Descends to the highest node inside the range, where the paths to lo and hi part, and
+			combines the part of its left subtree from lo, the node itself and the part of its right
+			subtree below hi. Whole subtrees are taken from their stored aggregates.
+		Time Complexity:
+			O(log n).
+		"""
+		monoid = self.monoid
+		node = self.root
+		while node.key is not None:
+			if lo is not None and node.key < lo:
+				node = node.right
+			elif hi is not None and hi <= node.key:
+				node = node.left
+			else:
+				break
+		if node.key is None:
+			return monoid.identity
+		left = node.left
+		if lo is None:
+			left_part = left.aggregate if left.key is not None else monoid.identity
+		else:
+			left_part = self.aggregate_from(left, lo)
+		right = node.right
+		if hi is None:
+			right_part = right.aggregate if right.key is not None else monoid.identity
+		else:
+			right_part = self.aggregate_below(right, hi)
+		return monoid.combine(monoid.combine(left_part, monoid.summarize(node.value)), right_part)
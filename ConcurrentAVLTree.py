@@ -0,0 +1,331 @@
+"""A thread-safe AVLTree wrapper: shared reads, exclusive writes"""
+
+import threading
+from contextlib import contextmanager
+
+from src.AVLTree import AVLTree
+
+
+class ReadWriteLock(object):
+	"""
+    Fields:
+        'mutex': threading.Lock guarding the counters
+        'condition': threading.Condition on mutex, for the threads that have to wait
+        'read_locked', 'write_locked': LockSide instances, the context managers of both sides
+        'readers': int, the number of threads holding the lock for reading
+        'writer': bool, whether a thread holds the lock for writing
+        'waiting_writers': int, the number of threads waiting to write
+    Output:
+        -
+    Description:
+        Any number of readers may hold the lock together; a writer holds it alone.
+        New readers wait while a writer is waiting, so a steady stream of readers cannot starve writers.
+        The lock is not reentrant. Use it as "with lock.read_locked:" or "with lock.write_locked:".
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+
+	def __init__(self):
+		self.mutex = threading.Lock()
+		self.condition = threading.Condition(self.mutex)
+		self.readers = 0
+		self.writer = False
+		self.waiting_writers = 0
+		self.read_locked = LockSide(self.acquire_read, self.release_read)
+		self.write_locked = LockSide(self.acquire_write, self.release_write)
+
+	def acquire_read(self):
+		with self.mutex:
+			if not (self.writer or self.waiting_writers):
+				self.readers += 1
+				return
+			while self.writer or self.waiting_writers:
+				self.condition.wait()
+			self.readers += 1
+
+	def release_read(self):
+		with self.mutex:
+			self.readers -= 1
+			if not self.readers and self.waiting_writers:
+				self.condition.notify_all()
+
+	def acquire_write(self):
+		with self.mutex:
+			self.waiting_writers += 1
+			while self.writer or self.readers:
+				self.condition.wait()
+			self.waiting_writers -= 1
+			self.writer = True
+
+	def release_write(self):
+		with self.mutex:
+			self.writer = False
+			self.condition.notify_all()
+
+
+class LockSide(object):
+	"""
+    Fields:
+        'acquire', 'release': the methods of one side of a ReadWriteLock
+    Description:
+        The context manager of ReadWriteLock.read_locked and write_locked: a plain class, as
+        entering it happens on every call of the wrapper and a generator-based one costs more.
+    """
+	__slots__ = ("acquire", "release")
+
+	def __init__(self, acquire, release):
+		self.acquire = acquire
+		self.release = release
+
+	def __enter__(self):
+		self.acquire()
+
+	def __exit__(self, *exc_info):
+		self.release()
+
+
+class ConcurrentAVLTree(object):
+	"""
+    Fields:
+        'tree': AVLTree instance holding the data
+        'lock': ReadWriteLock instance guarding it
+    Output:
+        -
+    Description:
+        Shares one AVLTree between threads. Queries that only read the tree (search, finger_search,
+        rank, ...) run under the read lock, concurrently with each other; updates (insert, delete, join,
+        split, upsert, pop, ...) rewire parent links, heights and the min/max nodes, and run under the write lock;
+        upsert, get_or_insert and pop also replace the racy search-then-insert or search-then-delete.
+        A node handed out under the read lock may be deleted by another writer before it is used:
+        delete(node) checks that node is still in the tree and does nothing otherwise, and
+        delete_key deletes by key under a single write lock.
+        Lazy traversals cannot hold a lock between steps, so range and avl_to_array return lists.
+        batch and apply_batch run many updates under a single write lock acquisition.
+
+    Time Complexity:
+        Overall O(1) on top of the wrapped AVLTree method.
+    """
+
+	def __init__(self, tree=None):
+		self.tree = AVLTree() if tree is None else tree
+		self.lock = ReadWriteLock()
+
+	# Reads
+
+	def search(self, key):
+		with self.lock.read_locked:
+			return self.tree.search(key)
+
+	def finger_search(self, key):
+		with self.lock.read_locked:
+			return self.tree.finger_search(key)
+
+	def search_many(self, keys):
+		with self.lock.read_locked:
+			return self.tree.search_many(keys)
+
+	def rank(self, key):
+		with self.lock.read_locked:
+			return self.tree.rank(key)
+
+	def select(self, index):
+		with self.lock.read_locked:
+			return self.tree.select(index)
+
+	def count_range(self, lo, hi):
+		with self.lock.read_locked:
+			return self.tree.count_range(lo, hi)
+
+	def range(self, lo, hi, reverse=False):
+		with self.lock.read_locked:
+			return list(self.tree.range(lo, hi, reverse))
+
+	def avl_to_array(self):
+		with self.lock.read_locked:
+			return self.tree.avl_to_array()
+
+	def max_node(self):
+		with self.lock.read_locked:
+			return self.tree.max_node()
+
+	def min_node(self):
+		with self.lock.read_locked:
+			return self.tree.min_node()
+
+	def size(self):
+		with self.lock.read_locked:
+			return self.tree.size()
+
+	def get_root(self):
+		with self.lock.read_locked:
+			return self.tree.get_root()
+
+	# Writes
+
+	def insert(self, key, val=""):
+		with self.lock.write_locked:
+			return self.tree.insert(key, val)
+
+	def finger_insert(self, key, val=""):
+		with self.lock.write_locked:
+			return self.tree.finger_insert(key, val)
+
+	def insert_many(self, items):
+		with self.lock.write_locked:
+			return self.tree.insert_many(items)
+
+	def delete(self, node):
+		"""
+		Input:
+			'self': ConcurrentAVLTree instance
+			'node': AVLNode instance, found by an earlier search
+		Output:
+			@type: AVLNode instance or None
+			the new root as returned by AVLTree.delete, None if node is no longer in the tree.
+		Description:
+			The read lock of the search that found node was released since, so another writer may have
+			deleted node meanwhile; node is deleted only if searching its key under the write lock still
+			leads to it. delete_key does the lookup and the deletion under one lock.
+		Time Complexity:
+			O(log n).
+		"""
+		with self.lock.write_locked:
+			if node.key is None or self.tree.search(node.key)[0] is not node:
+				return None
+			return self.tree.delete(node)
+
+	def upsert(self, key, val=""):
+		with self.lock.write_locked:
+			return self.tree.upsert(key, val)
+
+	def get_or_insert(self, key, factory):
+		"""
+		Description:
+			factory runs under the write lock, so it must not use this tree.
+		"""
+		with self.lock.write_locked:
+			return self.tree.get_or_insert(key, factory)
+
+	def pop(self, key, default=None):
+		with self.lock.write_locked:
+			return self.tree.pop(key, default)
+
+	def delete_key(self, key):
+		"""
+		Input:
+			'self': ConcurrentAVLTree instance
+			'key': int
+		Output:
+			@type: bool
+			whether key was in the dictionary.
+		Description:
+			Looks key up and deletes its node under one write lock, so no other writer can
+			delete or move the node in between, as could happen with search followed by delete.
+		Time Complexity:
+			O(log n).
+		"""
+		with self.lock.write_locked:
+			node = self.tree.search(key)[0]
+			if node is None:
+				return False
+			self.tree.delete(node)
+			return True
+
+	@contextmanager
+	def both_write_locked(self, other):
+		"""
+		Input:
+			'self', 'other': ConcurrentAVLTree instances
+		Output:
+			-
+		Description:
+			Write-locks both trees, always in the order of their ids, so two threads joining the same
+			pair of trees in opposite directions cannot deadlock. Raises ValueError if other is self,
+			as the write lock is not reentrant.
+		Time Complexity:
+			O(1).
+		"""
+		if other is self:
+			raise ValueError("cannot combine a tree with itself")
+		first, second = sorted((self, other), key=id)
+		with first.lock.write_locked, second.lock.write_locked:
+			yield
+
+	def join(self, tree2, key, val=""):
+		"""
+		Input:
+			'tree2': ConcurrentAVLTree instance, emptied by the join as in AVLTree.join
+		"""
+		with self.both_write_locked(tree2):
+			return self.tree.join(tree2.tree, key, val)
+
+	def union(self, tree2):
+		"""
+		Input:
+			'tree2': ConcurrentAVLTree instance, emptied as in AVLTree.union
+		Output:
+			@type: int
+			the number of PROMOTE cases during the joins.
+		Description:
+			AVLTree.union with both trees write-locked by both_write_locked;
+			intersection, difference and symmetric_difference are wrapped the same way.
+		Time Complexity:
+			O(m log(n/m + 1)) for trees of sizes m <= n.
+		"""
+		with self.both_write_locked(tree2):
+			return self.tree.union(tree2.tree)
+
+	def intersection(self, tree2):
+		with self.both_write_locked(tree2):
+			return self.tree.intersection(tree2.tree)
+
+	def difference(self, tree2):
+		with self.both_write_locked(tree2):
+			return self.tree.difference(tree2.tree)
+
+	def symmetric_difference(self, tree2):
+		with self.both_write_locked(tree2):
+			return self.tree.symmetric_difference(tree2.tree)
+
+	def split(self, node):
+		"""
+		Output:
+			@type: (ConcurrentAVLTree, ConcurrentAVLTree)
+			the two sides wrapped for concurrent use. As with AVLTree.split, self must not be used afterwards.
+		"""
+		with self.lock.write_locked:
+			left, right = self.tree.split(node)
+		return ConcurrentAVLTree(left), ConcurrentAVLTree(right)
+
+	@contextmanager
+	def batch(self):
+		"""
+		Input:
+			'self': ConcurrentAVLTree instance
+		Output:
+			the wrapped AVLTree, write-locked for the duration of the with block
+		Description:
+			with tree.batch() as avl: ... applies any sequence of updates to avl under a single
+			write lock acquisition; readers see either none or all of them.
+		Time Complexity:
+			O(1) on top of the updates.
+		"""
+		with self.lock.write_locked:
+			yield self.tree
+
+	def apply_batch(self, operations):
+		"""
+		Input:
+			'self': ConcurrentAVLTree instance
+			'operations': iterable of tuples (method name, *args), e.g. ("insert", 5, "five")
+		Output:
+			@type: list
+			the result of every operation, in order.
+		Description:
+			Applies the operations to the wrapped AVLTree under a single write lock acquisition.
+		Time Complexity:
+			The sum of the operations' costs.
+		"""
+		with self.batch() as tree:
+			return [getattr(tree, name)(*args) for name, *args in operations]
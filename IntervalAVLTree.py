@@ -0,0 +1,103 @@
+"""An AugmentedAVLTree of half-open intervals keyed by start point, answering stabbing and overlap queries"""
+
+import math
+import operator
+
+from src.AugmentedAVLTree import AugmentedAVLTree, Monoid
+
+# Values are (end, val) pairs; every subtree keeps the largest end point in it
+MAX_END = Monoid(max, -math.inf, operator.itemgetter(0))
+
+
+class IntervalAVLTree(AugmentedAVLTree):
+	"""
+    Fields:
+        -
+    Output:
+        -
+    Description:
+        An interval tree: the interval [start, end) is stored under the key start with the value (end, val),
+        and the MAX_END monoid keeps the largest end point of every subtree in its root's 'aggregate',
+        through rotations, join, split and the set operations as any AugmentedAVLTree summary.
+        Starts are keys, so they are distinct. items() and avl_to_array() yield (start, (end, val)) tuples.
+
+    Time Complexity:
+        As AugmentedAVLTree.
+    """
+	default_monoid = MAX_END
+
+	def insert_interval(self, start, end, val=""):
+		"""
+		Input:
+			'self': IntervalAVLTree instance
+			'start', 'end': the bounds of the non-empty half-open interval [start, end), start not yet in self
+			'val': the payload of the interval
+		Output:
+			the tuple (x,e,h) of insert.
+		Description:
+			Raises ValueError if the interval is empty.
+		Time Complexity:
+			O(log n).
+		"""
+		if not start < end:
+			raise ValueError("empty interval [%r, %r)" % (start, end))
+		return self.insert(start, (end, val))
+
+	def overlap_walk(self, lo, hi, closed):
+		"""
+		Input:
+			'self': IntervalAVLTree instance
+			'lo', 'hi': the query bounds
+			'closed': bool, whether starts equal to hi are included
+		Output:
+			a generator of the (start, end, val) tuples with end > lo and start < hi (start <= hi if closed),
+			in increasing start order.
+		Description:
+			An inorder walk that skips every subtree whose largest end point is not past lo, and stops at
+			the first start past hi: every node it visits lies on the path to a reported interval or to that
+			first start.
+		Time Complexity:
+			O(log n + k) for k reported intervals that are contiguous in start order;
+			O(log n + k log(n / k)) at worst, when they are scattered among intervals ending before lo.
+		"""
+		stack = []
+		node = self.root
+		while True:
+			while node.key is not None and node.aggregate > lo:
+				stack.append(node)
+				node = node.left
+			if not stack:
+				return
+			node = stack.pop()
+			if node.key > hi or (node.key == hi and not closed):
+				return
+			end, val = node.value
+			if end > lo:
+				yield node.key, end, val
+			node = node.right
+
+	def overlapping(self, lo, hi):
+		"""
+		Input:
+			'self': IntervalAVLTree instance
+			'lo', 'hi': the bounds of the half-open query window [lo, hi)
+		Output:
+			a generator of the (start, end, val) tuples of the intervals overlapping the window,
+			i.e. with start < hi and end > lo, in increasing start order.
+		Time Complexity:
+			As overlap_walk.
+		"""
+		return self.overlap_walk(lo, hi, False)
+
+	def stab(self, point):
+		"""
+		Input:
+			'self': IntervalAVLTree instance
+			'point': a point
+		Output:
+			a generator of the (start, end, val) tuples of the intervals containing point,
+			i.e. with start <= point < end, in increasing start order.
+		Time Complexity:
+			As overlap_walk.
+		"""
+		return self.overlap_walk(point, point, True)
@@ -0,0 +1,390 @@
+"""An AVLTree with O(log n) range updates of its values, applied lazily"""
+
+from src.AVLTree import AVLNode, AVLTree
+
+# The constant of a tag that assigns nothing
+KEEP = object()
+
+
+def compose(pending, tag):
+	"""
+	Input:
+		'pending': tuple (constant, delta) or None, an older tag
+		'tag': tuple (constant, delta), a newer tag
+	Output:
+		the single tag that has the effect of pending followed by tag.
+	Description:
+		A tag sets the value to constant (unless it is KEEP) and then adds delta (unless it is 0).
+		An assignment discards whatever came before it; an addition adds up with the older delta.
+	Time Complexity:
+		O(1).
+	"""
+	if pending is None or tag[0] is not KEEP:
+		return tag
+	return pending[0], pending[1] + tag[1]
+
+
+def apply(value, tag):
+	constant, delta = tag
+	if constant is not KEEP:
+		value = constant
+	if delta:
+		value = value + delta
+	return value
+
+
+class LazyAVLNode(AVLNode):
+	"""
+    Fields:
+        'pending': tuple (constant, delta) or None, an update not yet applied to the node's descendants
+    Output:
+        -
+    Description:
+        An AVLNode whose own value is always up to date, while its descendants may still owe it 'pending'.
+        A descendant's value is current once every ancestor up to the root has no pending tag.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	__slots__ = ("pending",)
+
+	def __init__(self, key=None, value=None, parent=None):
+		super().__init__(key, value, parent)
+		self.pending = None
+
+
+class LazyAVLTree(AVLTree):
+	"""
+    Fields:
+        -
+    Output:
+        -
+    Description:
+        An AVLTree whose add_range and assign_range update all the values of a key range in O(log n):
+        only the O(log n) nodes on the two boundary paths are updated at once, and every whole subtree
+        in between is tagged at its root.
+        A tag is pushed to the node's children right before the structure below it changes (the descents of
+        insert, delete, join and split, and every rotation), so a tag never reaches a node it was not meant for,
+        and right before a value is read: search, select, ceiling_node and the like push the path to the node they
+        return, items, range and the traversals built on them push the part of the tree they visit.
+        Nodes reached by other means (successor/predecessor, a Cursor) have current values after settle.
+        finger_search and finger_insert push the path from the root as well, so they cost O(log n).
+
+    Time Complexity:
+        O(1) per node on top of the AVLTree methods.
+    """
+	node_class = LazyAVLNode
+
+	def push(self, node):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'node': AVLNode instance
+		Output:
+			-
+		Description:
+			Applies node's pending tag to the values of its children and moves it into their own tags.
+		Time Complexity:
+			O(1).
+		"""
+		tag = node.pending
+		if tag is not None:
+			self.tag_subtree(node.left, tag)
+			self.tag_subtree(node.right, tag)
+			node.pending = None
+
+	def push_path(self, node):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'node': AVLNode instance of self, or a virtual node
+		Output:
+			-
+		Description:
+			Pushes the tags of node's ancestors, from the root down, so node's value is current.
+		Time Complexity:
+			O(log n).
+		"""
+		if node.key is None:
+			return
+		path = []
+		node = node.parent
+		while node is not None:
+			path.append(node)
+			node = node.parent
+		for node in reversed(path):
+			self.push(node)
+
+	def settle(self, lo=None, hi=None):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'lo', 'hi': int or None, the bounds of the half-open key range [lo, hi), None for no bound
+		Output:
+			-
+		Description:
+			Pushes every tag above a node with lo <= key < hi, so all their values are current.
+		Time Complexity:
+			O(log n + k) for k keys in the range.
+		"""
+		stack = [self.root]
+		while stack:
+			node = stack.pop()
+			if node.key is None:
+				continue
+			self.push(node)
+			if lo is None or lo < node.key:
+				stack.append(node.left)
+			if hi is None or node.key < hi:
+				stack.append(node.right)
+
+	def update_range(self, lo, hi, tag):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'lo', 'hi': int or None, the bounds of the half-open key range [lo, hi), None for no bound
+			'tag': tuple (constant, delta), as in compose
+		Output:
+			-
+		Description:
+			Descends, pushing as it goes, to the highest node inside the range, where the paths to lo and hi
+			part. Along the path to lo, every node >= lo is updated and its right subtree tagged as a whole;
+			the path to hi is handled the same way on the other side.
+			The tags above the updated nodes are pushed first, so the new tag always comes after the old ones.
+		Time Complexity:
+			O(log n), whatever the number of keys in the range.
+		"""
+		node = self.root
+		while node.key is not None:
+			self.push(node)
+			if lo is not None and node.key < lo:
+				node = node.right
+			elif hi is not None and hi <= node.key:
+				node = node.left
+			else:
+				break
+		if node.key is None:
+			return
+		node.value = apply(node.value, tag)
+		child = node.left
+		while child.key is not None:
+			self.push(child)
+			if lo is None or lo <= child.key:
+				child.value = apply(child.value, tag)
+				self.tag_subtree(child.right, tag)
+				child = child.left
+			else:
+				child = child.right
+		child = node.right
+		while child.key is not None:
+			self.push(child)
+			if hi is None or child.key < hi:
+				child.value = apply(child.value, tag)
+				self.tag_subtree(child.left, tag)
+				child = child.right
+			else:
+				child = child.left
+
+	def tag_subtree(self, node, tag):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'node': AVLNode instance, the root of a subtree that tag covers whole, or a virtual node
+			'tag': tuple (constant, delta), as in compose
+		Output:
+			-
+		Time Complexity:
+			O(1).
+		"""
+		if node.key is not None:
+			node.value = apply(node.value, tag)
+			node.pending = compose(node.pending, tag)
+
+	def add_range(self, lo, hi, delta):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'lo', 'hi': int or None, the bounds of the half-open key range [lo, hi), None for no bound
+			'delta': the amount to add to every value with lo <= key < hi
+		Output:
+			-
+		Time Complexity:
+			O(log n).
+		"""
+		self.update_range(lo, hi, (KEEP, delta))
+
+	def assign_range(self, lo, hi, val):
+		"""
+		Input:
+			'self': LazyAVLTree instance
+			'lo', 'hi': int or None, the bounds of the half-open key range [lo, hi), None for no bound
+			'val': the value every key with lo <= key < hi gets
+		Output:
+			-
+		Time Complexity:
+			O(log n).
+		"""
+		self.update_range(lo, hi, (val, 0))
+
+	# Structural changes: push before a node gets new descendants or loses some
+
+	def left_rotation(self, node):
+		self.push(node)
+		self.push(node.right)
+		super().left_rotation(node)
+
+	def right_rotation(self, node):
+		self.push(node)
+		self.push(node.left)
+		super().right_rotation(node)
+
+	def search_from(self, c_node, key):
+		"""
+		Input:
+			as in AVLTree.search_from
+		Output:
+			a tuple (x,e) as returned by AVLTree.search_from, with the value of x current.
+		Time Complexity:
+			O(log n), the path above c_node is pushed too.
+		"""
+		self.push_path(c_node)
+		ed_vis = 0
+		while c_node.key is not None:
+			if key == c_node.key:
+				return (c_node, ed_vis + 1)
+			self.push(c_node)
+			c_node = c_node.left if key < c_node.key else c_node.right
+			ed_vis += 1
+		return (None, ed_vis)
+
+	def locate(self, c_node, key):
+		"""
+		Output:
+			a tuple (x,p,e) as returned by AVLTree.locate, with the value of p current.
+		"""
+		node, parent, e = super().locate(c_node, key)
+		self.push_path(parent)
+		return node, parent, e
+
+	def search_many(self, keys):
+		results = super().search_many(keys)
+		for node, _ in results:
+			if node is not None:
+				self.push_path(node)
+		return results
+
+	def link_leaf(self, curr_node, new_node):
+		"""
+		Input:
+			as in AVLTree.link_leaf
+		Output:
+			@type: int
+			the number of edges descended from curr_node to the parent of new_node.
+		Description:
+			Pushes the whole path from the root to the new leaf's parent before linking it,
+			so no pending tag covers the new node.
+		Time Complexity:
+			O(log n).
+		"""
+		self.push_path(curr_node)
+		key = new_node.key
+		e = 0
+		while True:
+			self.push(curr_node)
+			child = curr_node.left if key < curr_node.key else curr_node.right
+			if child.key is None:
+				break
+			curr_node = child
+			e += 1
+		return e + super().link_leaf(curr_node, new_node)
+
+	def delete(self, node):
+		"""
+		Description:
+			As AVLTree.delete, once the path down to the node that takes node's place (node's successor,
+			if it has two children) and the nodes changing places are pushed.
+		"""
+		moved = node.next if node.left.key is not None and node.right.key is not None else node
+		self.push_path(moved)
+		self.push(moved)
+		self.push(node)
+		return super().delete(node)
+
+	def join_node(self, tree2, x, self_is_lower=None):
+		"""
+		Description:
+			As AVLTree.join_node, once the spine of the higher tree is pushed down to where x is attached
+			(down to the end x goes to, if the other tree is empty and no key is compared).
+			x itself must have no pending tag, as for the nodes split, concat and the set operations pass.
+		"""
+		self_is_real, tree2_is_real = self.root.key is not None, tree2.root.key is not None
+		if self_is_real and tree2_is_real:
+			higher, lower = (self, tree2) if self.root.height >= tree2.root.height else (tree2, self)
+			if self_is_lower is None:
+				spine = "left" if higher.root.key > lower.root.key else "right"
+			else:
+				spine = "left" if (higher is self) != self_is_lower else "right"
+			node = higher.root
+			while node.height > lower.root.height:
+				self.push(node)
+				node = getattr(node, spine)
+		elif self_is_lower is not None and (self_is_real or tree2_is_real):
+			node = self.root if self_is_real else tree2.root
+			spine = "right" if self_is_real == self_is_lower else "left"
+			while node.key is not None:
+				self.push(node)
+				node = getattr(node, spine)
+		return super().join_node(tree2, x, self_is_lower)
+
+	def split(self, node):
+		self.push_path(node)
+		self.push(node)
+		return super().split(node)
+
+	def split_by_key(self, key):
+		self.search_from(self.root, key)
+		return super().split_by_key(key)
+
+	def split_root(self):
+		self.push(self.root)
+		return super().split_root()
+
+	# Reads: push the tags above the nodes handed out
+
+	def select(self, index):
+		node = super().select(index)
+		self.push_path(node)
+		return node
+
+	def ceiling_node(self, key):
+		node = super().ceiling_node(key)
+		self.push_path(node)
+		return node
+
+	def lower_node(self, key):
+		node = super().lower_node(key)
+		self.push_path(node)
+		return node
+
+	def higher_node(self, key):
+		node = super().higher_node(key)
+		self.push_path(node)
+		return node
+
+	def max_node(self):
+		node = super().max_node()
+		self.push_path(node)
+		return node
+
+	def min_node(self):
+		node = super().min_node()
+		self.push_path(node)
+		return node
+
+	def range(self, lo, hi, reverse=False):
+		self.settle(lo, hi)
+		return super().range(lo, hi, reverse)
+
+	def items(self):
+		self.settle()
+		return super().items()
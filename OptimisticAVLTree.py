@@ -0,0 +1,275 @@
+"""An AVLTree whose searches run without locks, validated by per-node version counters"""
+
+import threading
+from contextlib import contextmanager
+
+from src.AVLTree import AVLNode, AVLTree
+
+# Per writer thread: the list of objects made odd by the update in progress, None outside updates
+current_write = threading.local()
+current_write.touched = None
+
+
+def mark_written(obj, name, value):
+	"""
+	Input:
+		'obj': VersionedAVLNode or VersionedAVLTree instance
+		'name', 'value': the field to set and its new value
+	Output:
+		-
+	Description:
+		Inside versioned_write, the first write to obj makes its version odd and obj stays odd until the
+		update ends, so a rotation or a deletion relinking several nodes is seen by readers as one change.
+		Outside it, the version is bumped before and after the single write.
+	Time Complexity:
+		O(1).
+	"""
+	touched = getattr(current_write, "touched", None)
+	if touched is None:
+		object.__setattr__(obj, "version", obj.version + 1)
+		object.__setattr__(obj, name, value)
+		object.__setattr__(obj, "version", obj.version + 1)
+	else:
+		if not obj.version & 1:
+			object.__setattr__(obj, "version", obj.version + 1)
+			touched.append(obj)
+		object.__setattr__(obj, name, value)
+
+
+@contextmanager
+def versioned_write():
+	"""
+	Input:
+		-
+	Output:
+		-
+	Description:
+		Brackets one update of a VersionedAVLTree: every node and tree it writes stays odd until
+		the with block ends, then all of them become even again at once.
+	Time Complexity:
+		O(k) for k objects written.
+	"""
+	current_write.touched = touched = []
+	try:
+		yield
+	finally:
+		current_write.touched = None
+		for obj in touched:
+			object.__setattr__(obj, "version", obj.version + 1)
+
+
+class VersionedAVLNode(AVLNode):
+	"""
+    Fields:
+        'version': int, even while the node is stable, odd while an update relinking it is in progress
+    Output:
+        -
+    Description:
+        An AVLNode that acts as a sequence lock on the fields a search reads: every assignment to
+        key, value, left or right goes through mark_written. A reader that saw the same even version
+        before and after reading the node knows no update changed it in between.
+        Heights, sizes and parent links are not read by searches and are written without a bump.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	__slots__ = ("version",)
+	tracked_fields = frozenset(("key", "value", "left", "right"))
+
+	def __init__(self, key, value="", parent=None):
+		object.__setattr__(self, "version", 0)
+		super().__init__(key, value, parent)
+
+	def __setattr__(self, name, value):
+		if name in VersionedAVLNode.tracked_fields:
+			mark_written(self, name, value)
+		else:
+			object.__setattr__(self, name, value)
+
+
+class VersionedAVLTree(AVLTree):
+	"""
+    Fields:
+        'version': int, versions the 'root' pointer as VersionedAVLNode does its links
+    Output:
+        -
+    Description:
+        An AVLTree made of VersionedAVLNode nodes. Deleting the root replaces self.root without touching
+        any node a reader may already stand on, so the root pointer carries a version of its own.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	node_class = VersionedAVLNode
+
+	def __init__(self, *args, **kwargs):
+		object.__setattr__(self, "version", 0)
+		super().__init__(*args, **kwargs)
+
+	def __setattr__(self, name, value):
+		if name == "root":
+			mark_written(self, name, value)
+		else:
+			object.__setattr__(self, name, value)
+
+
+class OptimisticAVLTree(object):
+	"""
+    Fields:
+        'tree': VersionedAVLTree instance holding the data
+        'write_lock': threading.Lock serializing the updates
+        'fallbacks': int, the number of searches that gave up on optimism and took the lock
+    Output:
+        -
+    Description:
+        Shares one AVLTree between threads for free-threaded (no-GIL) Python builds.
+        search takes no lock at all: it records the version of every node on its path and of the root
+        pointer, and validates them after the descent, retrying if a writer changed any of them meanwhile.
+        Every update runs inside versioned_write, which keeps all the nodes it relinks odd until it is done,
+        so the nodes touched by insertion_rebalance and the rotations are effectively locked against readers.
+        Writers only disturb the readers whose path crosses such a node, so readers in other parts
+        of the tree and writers proceed in parallel.
+        Updates are serialized by 'write_lock': every insert or delete changes the subtree size of the root,
+        so two updates always touch a common node and could not run concurrently anyway.
+        Queries other than search walk parent links or whole subtrees and take the write lock too.
+        A node returned by search may be deleted by a writer before it is used: delete(node) checks that
+        node is still in the tree and does nothing otherwise, and delete_key deletes by key under one lock.
+
+    Time Complexity:
+        Overall O(1) on top of the wrapped AVLTree method.
+    """
+	# Attempts of a lock-free search before it takes the write lock
+	OPTIMISTIC_RETRIES = 8
+	# No valid AVL tree of a size that fits in memory is that high; a longer walk met a half-made rotation
+	MAX_PATH = 128
+
+	def __init__(self, tree=None):
+		self.tree = VersionedAVLTree() if tree is None else tree
+		self.write_lock = threading.Lock()
+		self.fallbacks = 0
+
+	@classmethod
+	def from_sorted(cls, iterable):
+		return cls(VersionedAVLTree.from_sorted(iterable))
+
+	def optimistic_search(self, key):
+		"""
+		Input:
+			'self': OptimisticAVLTree instance
+			'key': int
+		Output:
+			the tuple (x,e) of AVLTree.search if no writer interfered with the descent, None otherwise.
+		Description:
+			One lock-free attempt: reads every node's version before its fields, and checks
+			at the end that the root pointer and all the versions on the path are unchanged and even.
+		Time Complexity:
+			O(log n).
+		"""
+		tree = self.tree
+		tree_version = tree.version
+		if tree_version & 1:
+			return None
+		path = []
+		node = tree.root
+		result = None
+		while node.is_real_node():
+			version = node.version
+			if version & 1 or len(path) == self.MAX_PATH:
+				return None
+			path.append((node, version))
+			node_key = node.key
+			if key == node_key:
+				result = node
+				break
+			node = node.left if key < node_key else node.right
+		if tree.version != tree_version:
+			return None
+		for node, version in path:
+			if node.version != version:
+				return None
+		return result, len(path)
+
+	def search(self, key):
+		"""
+		Input:
+			'self': OptimisticAVLTree instance
+			'key': int
+		Output:
+			a tuple (x,e) where x is the node corresponding to key (or None if not found),
+			and e is the number of edges on the path between the starting node and ending node+1.
+		Description:
+			Runs optimistic_search up to OPTIMISTIC_RETRIES times and falls back to a search under the write lock.
+		Time Complexity:
+			O(log n) per attempt.
+		"""
+		for _ in range(self.OPTIMISTIC_RETRIES):
+			result = self.optimistic_search(key)
+			if result is not None:
+				return result
+		with self.write_lock:
+			self.fallbacks += 1
+			return self.tree.search(key)
+
+	def insert(self, key, val=""):
+		with self.write_lock, versioned_write():
+			return self.tree.insert(key, val)
+
+	def finger_insert(self, key, val=""):
+		with self.write_lock, versioned_write():
+			return self.tree.finger_insert(key, val)
+
+	def insert_many(self, items):
+		with self.write_lock, versioned_write():
+			return self.tree.insert_many(items)
+
+	def delete(self, node):
+		"""
+		Output:
+			the new root as returned by AVLTree.delete, None if node is no longer in the tree.
+		Description:
+			As ConcurrentAVLTree.delete: node came from a search that holds no lock, so it is deleted only if
+			searching its key under the write lock still leads to it.
+		"""
+		with self.write_lock, versioned_write():
+			if node.key is None or self.tree.search(node.key)[0] is not node:
+				return None
+			return self.tree.delete(node)
+
+	def upsert(self, key, val=""):
+		with self.write_lock, versioned_write():
+			return self.tree.upsert(key, val)
+
+	def get_or_insert(self, key, factory):
+		with self.write_lock, versioned_write():
+			return self.tree.get_or_insert(key, factory)
+
+	def pop(self, key, default=None):
+		with self.write_lock, versioned_write():
+			return self.tree.pop(key, default)
+
+	def delete_key(self, key):
+		"""
+		Output:
+			@type: bool
+			whether key was in the dictionary; the lookup and the deletion happen under one lock.
+		"""
+		with self.write_lock, versioned_write():
+			node = self.tree.search(key)[0]
+			if node is None:
+				return False
+			self.tree.delete(node)
+			return True
+
+	def finger_search(self, key):
+		with self.write_lock:
+			return self.tree.finger_search(key)
+
+	def avl_to_array(self):
+		with self.write_lock:
+			return self.tree.avl_to_array()
+
+	def size(self):
+		return self.tree.size()
+
+	def get_root(self):
+		return self.tree.get_root()
@@ -0,0 +1,389 @@
+"""A persistent AVL tree: every update returns a new version sharing its untouched subtrees"""
+
+
+class PersistentAVLNode(object):
+	"""
+    Fields:
+        'key': int or None
+        'value': string
+        'left': PersistentAVLNode instance
+        'right': PersistentAVLNode instance
+        'height': int
+        'size': int, the number of real nodes in the subtree
+    Output:
+        -
+    Description:
+        An immutable AVL node. Nodes keep no parent link, so one node can belong to any
+        number of tree versions at once; an update copies the nodes on its path and shares the rest.
+        The virtual node (key None, height -1, size 0) is shared by every version.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+	__slots__ = ("key", "value", "left", "right", "height", "size")
+	virtual_node = None
+
+	def __init__(self, key, value="", left=None, right=None):
+		self.key = key
+		self.value = value
+		if key is None:
+			self.left = self.right = None
+			self.height = -1
+			self.size = 0
+		else:
+			self.left = left
+			self.right = right
+			self.height = max(left.height, right.height) + 1
+			self.size = left.size + right.size + 1
+
+	def is_real_node(self):
+		"""
+		Input:
+			self - a node
+		Output:
+			@type: bool
+			False if self is a virtual node, True otherwise.
+		Time Complexity:
+			Overall O(1), as all methods are constant.
+		"""
+		return self.key is not None
+
+
+PersistentAVLNode.virtual_node = PersistentAVLNode(None)
+
+
+def balance(key, val, left, right):
+	"""
+	Input:
+		'key', 'val': the item of the new node
+		'left', 'right': PersistentAVLNode instances, AVL subtrees whose heights differ by at most 2
+	Output:
+		@type: PersistentAVLNode instance
+		a new balanced subtree holding left, the item and right.
+	Description:
+		Builds the node and, if its balance factor is +-2, applies the single or double rotation
+		on new copies of the nodes involved, as rebalance_rotation does in place.
+	Time Complexity:
+		O(1).
+	"""
+	if left.height > right.height + 1:
+		if left.left.height >= left.right.height:
+			return PersistentAVLNode(left.key, left.value, left.left, PersistentAVLNode(key, val, left.right, right))
+		middle = left.right
+		return PersistentAVLNode(middle.key, middle.value, PersistentAVLNode(left.key, left.value, left.left, middle.left),
+								 PersistentAVLNode(key, val, middle.right, right))
+	if right.height > left.height + 1:
+		if right.right.height >= right.left.height:
+			return PersistentAVLNode(right.key, right.value, PersistentAVLNode(key, val, left, right.left), right.right)
+		middle = right.left
+		return PersistentAVLNode(middle.key, middle.value, PersistentAVLNode(key, val, left, middle.left),
+								 PersistentAVLNode(right.key, right.value, middle.right, right.right))
+	return PersistentAVLNode(key, val, left, right)
+
+
+def insert_node(node, key, val):
+	"""
+	Input:
+		'node': PersistentAVLNode instance, the root of a subtree
+		'key', 'val': the item to insert; if key is already there its value is replaced
+	Output:
+		@type: PersistentAVLNode instance
+		the root of the new version of the subtree.
+	Time Complexity:
+		O(log n), one new node per level of the path.
+	"""
+	if not node.is_real_node():
+		return PersistentAVLNode(key, val, node, node)
+	if key == node.key:
+		return PersistentAVLNode(key, val, node.left, node.right)
+	if key < node.key:
+		return balance(node.key, node.value, insert_node(node.left, key, val), node.right)
+	return balance(node.key, node.value, node.left, insert_node(node.right, key, val))
+
+
+def pop_min(node):
+	"""
+	Input:
+		'node': PersistentAVLNode instance, the root of a non-empty subtree
+	Output:
+		a tuple (m, rest): the node with the smallest key and the new version of the subtree without it.
+	Time Complexity:
+		O(log n).
+	"""
+	if not node.left.is_real_node():
+		return node, node.right
+	smallest, rest = pop_min(node.left)
+	return smallest, balance(node.key, node.value, rest, node.right)
+
+
+def delete_node(node, key):
+	"""
+	Input:
+		'node': PersistentAVLNode instance, the root of a subtree
+		'key': int
+	Output:
+		@type: PersistentAVLNode instance
+		the root of the new version of the subtree without key, 'node' itself if key is not there.
+	Description:
+		A node with two children is replaced by a copy of its successor, taken out with pop_min.
+	Time Complexity:
+		O(log n).
+	"""
+	if not node.is_real_node():
+		return node
+	if key < node.key:
+		left = delete_node(node.left, key)
+		return node if left is node.left else balance(node.key, node.value, left, node.right)
+	if node.key < key:
+		right = delete_node(node.right, key)
+		return node if right is node.right else balance(node.key, node.value, node.left, right)
+	if not node.left.is_real_node():
+		return node.right
+	if not node.right.is_real_node():
+		return node.left
+	successor, right = pop_min(node.right)
+	return balance(successor.key, successor.value, node.left, right)
+
+
+def join_nodes(left, key, val, right):
+	"""
+	Input:
+		'left', 'right': PersistentAVLNode instances, all keys of left smaller than key and all keys of right larger
+		'key', 'val': the separating item
+	Output:
+		@type: PersistentAVLNode instance
+		the root of a new subtree holding left, the item and right.
+	Description:
+		Descends the spine of the taller tree facing the other one until the heights are within one,
+		attaches the item there and rebalances the copied spine on the way back.
+	Time Complexity:
+		O(|left.height - right.height| + 1).
+	"""
+	if left.height > right.height + 1:
+		return balance(left.key, left.value, left.left, join_nodes(left.right, key, val, right))
+	if right.height > left.height + 1:
+		return balance(right.key, right.value, join_nodes(left, key, val, right.left), right.right)
+	return PersistentAVLNode(key, val, left, right)
+
+
+def split_node(node, key):
+	"""
+	Input:
+		'node': PersistentAVLNode instance, the root of a subtree
+		'key': int, not necessarily in the subtree
+	Output:
+		a tuple (left, found, right): the subtrees of the keys smaller and larger than key,
+		and the node of key (None if it is not there).
+	Description:
+		Descends towards key and joins the pieces left behind on each side on the way back.
+	Time Complexity:
+		O(log n), the joins telescope.
+	"""
+	if not node.is_real_node():
+		return node, None, node
+	if key == node.key:
+		return node.left, node, node.right
+	if key < node.key:
+		left, found, right = split_node(node.left, key)
+		return left, found, join_nodes(right, node.key, node.value, node.right)
+	left, found, right = split_node(node.right, key)
+	return join_nodes(node.left, node.key, node.value, left), found, right
+
+
+class PersistentAVLTree(object):
+	"""
+    Fields:
+        'root': PersistentAVLNode instance
+    Output:
+        -
+    Description:
+        An immutable version of a dictionary. insert, delete, join and split never modify a version:
+        they return new ones, which copy the O(log n) nodes on the paths they change and share every other
+        subtree with their source. Keeping a reference to a version is therefore an O(1) snapshot that
+        later updates cannot disturb, and as nodes have no parent links, a version that is no longer
+        referenced is reclaimed by reference counting, except for the nodes a newer version shares.
+
+    Time Complexity:
+        Overall O(1), as all methods are constant.
+    """
+
+	def __init__(self, root=PersistentAVLNode.virtual_node):
+		self.root = root
+
+	@classmethod
+	def from_sorted(cls, iterable):
+		"""
+		Input:
+			'iterable': (key, value) tuples in strictly increasing key order, e.g. AVLTree.items()
+		Output:
+			@type: PersistentAVLTree instance
+			A perfectly balanced version holding the given items.
+		Time Complexity:
+			O(n).
+		"""
+		items = list(iterable)
+
+		def build(start, end):
+			if start >= end:
+				return PersistentAVLNode.virtual_node
+			middle = (start + end) // 2
+			key, val = items[middle]
+			return PersistentAVLNode(key, val, build(start, middle), build(middle + 1, end))
+
+		return cls(build(0, len(items)))
+
+	def search(self, key):
+		"""
+		Input:
+			'self': PersistentAVLTree instance
+			'key': int
+		Output:
+			a tuple (x,e) where x is the node corresponding to key (or None if not found),
+			and e is the number of edges on the path between the starting node and ending node+1.
+		Time Complexity:
+			O(log n).
+		"""
+		node = self.root
+		e = 0
+		while node.is_real_node():
+			e += 1
+			if key == node.key:
+				return node, e
+			node = node.left if key < node.key else node.right
+		return None, e
+
+	def insert(self, key, val=""):
+		"""
+		Input:
+			'self': PersistentAVLTree instance
+			'key': int
+			'val': string
+		Output:
+			@type: PersistentAVLTree instance
+			a new version holding key with val, which replaces the old value if key was already there.
+		Time Complexity:
+			O(log n) time and new nodes.
+		"""
+		return PersistentAVLTree(insert_node(self.root, key, val))
+
+	def delete(self, key):
+		"""
+		Input:
+			'self': PersistentAVLTree instance
+			'key': int
+		Output:
+			@type: PersistentAVLTree instance
+			a new version without key, self if key is not in the dictionary.
+		Time Complexity:
+			O(log n) time and new nodes.
+		"""
+		root = delete_node(self.root, key)
+		return self if root is self.root else PersistentAVLTree(root)
+
+	def join(self, tree2, key, val=""):
+		"""
+		Input:
+			'self', 'tree2': PersistentAVLTree instances
+			'key': int, the key separating them
+			'val': string
+		Output:
+			@type: PersistentAVLTree instance
+			a new version holding self, tree2 and the item; both inputs are left unchanged.
+		Description:
+			@pre: all keys in self are smaller than key and all keys in tree2 are larger than key,
+			or the opposite way.
+		Time Complexity:
+			O(log n).
+		"""
+		if self.root.is_real_node():
+			self_is_lower = self.root.key < key
+		else:
+			self_is_lower = not (tree2.root.is_real_node() and tree2.root.key < key)
+		if self_is_lower:
+			return PersistentAVLTree(join_nodes(self.root, key, val, tree2.root))
+		return PersistentAVLTree(join_nodes(tree2.root, key, val, self.root))
+
+	def split(self, key):
+		"""
+		Input:
+			'self': PersistentAVLTree instance
+			'key': int, not necessarily in the dictionary
+		Output:
+			@type: (PersistentAVLTree, PersistentAVLTree)
+			new versions holding the keys smaller and larger than key; self is left unchanged.
+		Time Complexity:
+			O(log n).
+		"""
+		left, _, right = split_node(self.root, key)
+		return PersistentAVLTree(left), PersistentAVLTree(right)
+
+	def items(self):
+		"""
+		Input:
+			'self': PersistentAVLTree instance
+		Output:
+			a generator of (key, value) tuples in increasing key order
+		Description:
+			Lazy inorder traversal with an explicit stack. The version cannot change underneath it.
+		Time Complexity:
+			O(1) amortized per step, O(n) overall.
+		"""
+		stack = []
+		node = self.root
+		while stack or node.is_real_node():
+			if node.is_real_node():
+				stack.append(node)
+				node = node.left
+			else:
+				node = stack.pop()
+				yield node.key, node.value
+				node = node.right
+
+	def __iter__(self):
+		return (key for key, _ in self.items())
+
+	def avl_to_array(self):
+		"""
+		Output:
+			a sorted list according to key of tuples (key, value) representing the version
+		Time Complexity:
+			O(n)
+		"""
+		return list(self.items())
+
+	def max_node(self):
+		"""
+		Output:
+			@type: PersistentAVLNode
+			The maximal node of the version, None if it is empty.
+		Time Complexity:
+			O(log n), versions do not cache it.
+		"""
+		node = self.root
+		if not node.is_real_node():
+			return None
+		while node.right.is_real_node():
+			node = node.right
+		return node
+
+	def size(self):
+		"""
+		Output:
+			@type: int
+			the number of items in the version
+		Time Complexity:
+			O(1).
+		"""
+		return self.root.size
+
+	def get_root(self):
+		"""
+		Output:
+			@type: PersistentAVLNode
+			The root of the version, None if it is empty.
+		Time Complexity:
+			O(1).
+		"""
+		if self.root.is_real_node():
+			return self.root
+		return None
@@ -0,0 +1,236 @@
+"""A sequence addressed by position (a rope), stored in an AVLTree whose order is implicit"""
+
+from src.AVLTree import AVLTree
+
+# The key of every node: a node's position comes from the subtree sizes, not from its key
+IMPLICIT_KEY = 0
+
+
+class RopeAVLTree(AVLTree):
+	"""
+    Fields:
+        -
+    Output:
+        -
+    Description:
+        A list-like sequence with O(log n) insertion and deletion at any position, split and concat.
+        Items are node values, in the tree's inorder; every key is IMPLICIT_KEY, and the index of a node
+        is the number of nodes before it, found from the subtree sizes as in AVLTree.select.
+        The rotations, delete, join_node (given self_is_lower) and split never compare keys, so they are
+        reused as they are; the methods that search by key (search, insert, rank, range, the set operations...)
+        do not apply to a rope.
+
+    Time Complexity:
+        O(log n) per positional operation, O(1) for len.
+    """
+
+	@classmethod
+	def from_iterable(cls, iterable):
+		"""
+		Input:
+			'iterable': the items, in order
+		Output:
+			@type: RopeAVLTree instance
+			A perfectly balanced rope holding the items.
+		Time Complexity:
+			O(n).
+		"""
+		rope = cls()
+		items = [(IMPLICIT_KEY, item) for item in iterable]
+		rope.root = rope.build_balanced(items, 0, len(items))
+		rope.max_tree_node = rope.find_max()
+		rope.min_tree_node = rope.find_min()
+		rope.tree_size = len(items)
+		return rope
+
+	def __len__(self):
+		return self.root.size
+
+	def __iter__(self):
+		return self.values()
+
+	def position(self, index, end_allowed=False):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'index': int, negative indices count from the end as for a list
+			'end_allowed': bool, whether len(self) is a valid position (for insertion)
+		Output:
+			@type: int
+			index, in range(len(self)) (or range(len(self) + 1) if end_allowed).
+		Description:
+			Raises IndexError if index is out of range.
+		Time Complexity:
+			O(1).
+		"""
+		size = self.root.size
+		if index < 0:
+			index += size
+		if not 0 <= index < size + end_allowed:
+			raise IndexError("rope index out of range")
+		return index
+
+	def node_at(self, index):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'index': int, as in position
+		Output:
+			@type: AVLNode instance
+			The node of the item at index.
+		Time Complexity:
+			O(log n).
+		"""
+		return self.select(self.position(index))
+
+	def __getitem__(self, index):
+		return self.node_at(index).value
+
+	def __setitem__(self, index, item):
+		self.node_at(index).value = item
+
+	def index_of(self, node):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'node': AVLNode instance of self
+		Output:
+			@type: int
+			The current index of node, which moves as items are inserted or deleted before it.
+		Description:
+			Climbs to the root; whenever the climb comes from a right child, the parent and its
+			left subtree come before node.
+		Time Complexity:
+			O(log n).
+		"""
+		index = node.left.size
+		while node.parent is not None:
+			if node.parent.right is node:
+				index += node.parent.left.size + 1
+			node = node.parent
+		return index
+
+	def insert_at(self, index, item):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'index': int, as in position, len(self) to append
+			'item': the item to insert, which gets index 'index'
+		Output:
+			@type: AVLNode instance
+			the new node.
+		Description:
+			The new node becomes the left child of the node currently at index if that one has no left child,
+			and the right child of its predecessor otherwise (the last node, when appending);
+			it is threaded between them and the path above it is rebalanced as by insert.
+		Time Complexity:
+			O(log n).
+		"""
+		index = self.position(index, True)
+		node = self.node_class(IMPLICIT_KEY, item)
+		if not self.root.is_real_node():
+			self.root = self.max_tree_node = self.min_tree_node = node
+			self.tree_size = 1
+			return node
+		if index == self.root.size:
+			after = None
+			parent = self.max_tree_node
+			parent.right = node
+			self.max_tree_node = node
+		else:
+			after = self.select(index)
+			if not after.left.is_real_node():
+				parent = after
+				parent.left = node
+			else:
+				parent = after.prev
+				parent.right = node
+			if index == 0:
+				self.min_tree_node = node
+		node.parent = parent
+		self.thread_between(parent if after is None else after.prev, node, after)
+		self.insertion_rebalance(parent)
+		self.tree_size = self.root.size
+		return node
+
+	def delete_at(self, index):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'index': int, as in position
+		Output:
+			the item that was at index.
+		Time Complexity:
+			O(log n).
+		"""
+		node = self.node_at(index)
+		self.delete(node)
+		return node.value
+
+	def split_at(self, index):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'index': int, as in position, len(self) allowed
+		Output:
+			@type: (RopeAVLTree, RopeAVLTree)
+			the items before index and the items from index on. self must not be used afterwards.
+		Description:
+			Splits around the node at index with AVLTree.split and joins that node back
+			in front of the right side.
+		Time Complexity:
+			O(log n).
+		"""
+		index = self.position(index, True)
+		if index == self.root.size:
+			return self, self.make_tree()
+		node = self.select(index)
+		left, right = self.split(node)
+		rest = self.make_tree()
+		rest.join_node(right, node, True)
+		return left, rest
+
+	def concat(self, tree2):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'tree2': RopeAVLTree instance, whose items are appended to self's
+		Output:
+			@type: int
+			the number of PROMOTE cases during the join.
+		Description:
+			As AVLTree.concat, with self always holding the first items: the last node of self is deleted
+			and joins both ropes as their separating node. After the concat, tree2 becomes empty.
+		Time Complexity:
+			O(log n).
+		"""
+		if not tree2.root.is_real_node():
+			return 0
+		if not self.root.is_real_node():
+			self.convert_tree(tree2)
+			tree2.create_root(None)
+			return 0
+		separator = self.max_tree_node
+		self.delete(separator)
+		return self.join_node(tree2, separator, True)
+
+	def slice(self, start=None, stop=None):
+		"""
+		Input:
+			'self': RopeAVLTree instance
+			'start', 'stop': int or None, as in a list slice self[start:stop]
+		Output:
+			@type: RopeAVLTree instance
+			a new rope holding a copy of the items from start up to stop; self is unchanged.
+			(split_at takes a piece out of self in O(log n) instead.)
+		Time Complexity:
+			O(log n + k) for k items in the slice.
+		"""
+		start, stop, _ = slice(start, stop).indices(self.root.size)
+		items = []
+		if start < stop:
+			node = self.select(start)
+			for _ in range(stop - start):
+				items.append(node.value)
+				node = node.next
+		return self.from_iterable(items)
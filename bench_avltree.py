@@ -0,0 +1,252 @@
+"""Benchmarks of the AVLTree operations across key stream shapes and sizes
+
+usage (from the directory containing the package as src/):
+    python -m src.bench_avltree [--sizes 1000 10000 ...] [--shapes random zipfian ...] [--ops insert search ...]
+                                [--save baseline.json] [--baseline baseline.json --threshold 0.25]
+
+Every benchmark reports throughput (ops/s), per-operation latency percentiles and the peak memory
+traced while it runs. --save stores the results as a JSON baseline; --baseline compares against one
+and exits with status 1 if any benchmark lost more than --threshold of its throughput.
+Everything is deterministic for a given --seed and needs nothing beyond the standard library.
+"""
+
+import argparse
+import bisect
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.AVLTree import AVLTree
+
+SHAPES = ("sequential", "reverse", "random", "zipfian", "clustered")
+OPERATIONS = ("insert", "finger_insert", "search", "finger_search", "delete", "join", "split", "avl_to_array")
+ZIPF_EXPONENT = 1.1
+CLUSTER_LENGTH = 64
+
+
+def key_streams(shape, n, seed):
+	"""
+	Input:
+		'shape': one of SHAPES
+		'n': int, the number of keys
+		'seed': int
+	Output:
+		a tuple (inserts, queries): the n distinct keys 0, 2, ..., 2n-2 in the order the shape inserts them,
+		and n stored keys in the order the shape looks them up.
+	Description:
+		sequential and reverse walk the keys in increasing and decreasing order; random is uniform;
+		zipfian gives the key of popularity rank r a weight of 1 / r ** ZIPF_EXPONENT, with the ranks scattered
+		over the key space, so inserts tend to start with the hot keys and queries keep coming back to them;
+		clustered visits runs of CLUSTER_LENGTH neighbouring keys starting at random places.
+	Time Complexity:
+		O(n log n).
+	"""
+	rng = random.Random(seed)
+	keys = list(range(0, 2 * n, 2))
+	if shape == "sequential":
+		return keys, list(keys)
+	if shape == "reverse":
+		return keys[::-1], keys[::-1]
+	if shape == "random":
+		inserts = list(keys)
+		rng.shuffle(inserts)
+		return inserts, [rng.choice(keys) for _ in range(n)]
+	if shape == "zipfian":
+		by_rank = list(keys)
+		rng.shuffle(by_rank)
+		weights = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(n)]
+		# Weighted shuffle (Efraimidis-Spirakis): heavier keys tend to come first
+		priorities = [rng.random() ** (1 / weight) for weight in weights]
+		inserts = [key for _, key in sorted(zip(priorities, by_rank), reverse=True)]
+		cumulative = []
+		total = 0
+		for weight in weights:
+			total += weight
+			cumulative.append(total)
+		return inserts, [by_rank[bisect.bisect_left(cumulative, rng.random() * total)] for _ in range(n)]
+	if shape == "clustered":
+		starts = list(range(0, n, CLUSTER_LENGTH))
+		rng.shuffle(starts)
+		inserts = [keys[i] for start in starts for i in range(start, min(start + CLUSTER_LENGTH, n))]
+		queries = []
+		while len(queries) < n:
+			start = rng.randrange(n)
+			queries.extend(keys[start:start + CLUSTER_LENGTH])
+		return inserts, queries[:n]
+	raise ValueError("unknown key stream shape %r" % shape)
+
+
+def timed(operation, arguments, latencies):
+	"""
+	Input:
+		'operation': a callable
+		'arguments': iterable of argument tuples
+		'latencies': list collecting the duration of every call in nanoseconds
+	Output:
+		-
+	"""
+	clock = time.perf_counter_ns
+	append = latencies.append
+	for args in arguments:
+		start = clock()
+		operation(*args)
+		append(clock() - start)
+
+
+def run_operation(op, inserts, queries, latencies):
+	"""
+	Input:
+		'op': one of OPERATIONS
+		'inserts', 'queries': the key streams of key_streams
+		'latencies': list collecting the per-operation latencies
+	Output:
+		@type: int
+		the number of operations performed (items produced, for avl_to_array).
+	Description:
+		Builds the starting tree (insert and finger_insert start empty, the rest from_sorted) outside
+		the timed calls and times every operation separately.
+	"""
+	if op in ("insert", "finger_insert"):
+		tree = AVLTree()
+		timed(getattr(tree, op), ((key, "") for key in inserts), latencies)
+		return len(inserts)
+	tree = AVLTree.from_sorted((key, "") for key in sorted(inserts))
+	if op in ("search", "finger_search"):
+		timed(getattr(tree, op), ((key,) for key in queries), latencies)
+		return len(queries)
+	if op == "delete":
+		nodes = [tree.search(key)[0] for key in inserts]
+		timed(tree.delete, ((node,) for node in nodes), latencies)
+		return len(nodes)
+	if op in ("join", "split"):
+		# Alternate split at a query key and join of the two sides back, timing only the requested half
+		rounds = min(len(queries), 1000)
+		clock = time.perf_counter_ns
+		for key in queries[:rounds]:
+			node = tree.search(key)[0]
+			start = clock()
+			left, right = tree.split(node)
+			middle = clock()
+			left.join(right, node.key, node.value)
+			end = clock()
+			latencies.append(middle - start if op == "split" else end - middle)
+			tree = left
+		return rounds
+	if op == "avl_to_array":
+		rounds = max(1, 100000 // len(inserts))
+		timed(tree.avl_to_array, [()] * rounds, latencies)
+		return rounds * len(inserts)
+	raise ValueError("unknown operation %r" % op)
+
+
+def percentile(values, fraction):
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark(op, shape, n, seed, memory=True, repeat=3):
+	"""
+	Input:
+		'op', 'shape', 'n', 'seed': what to run, as in run_operation and key_streams
+		'memory': bool, whether to run it once more under tracemalloc for the peak memory
+		'repeat': int, the number of timed runs; the fastest one is reported, as in timeit
+	Output:
+		@type: dict
+		ops_per_sec, p50_us and p99_us of the fastest timed run, and peak_kib of the traced run (None if skipped).
+	"""
+	inserts, queries = key_streams(shape, n, seed)
+	result = None
+	for _ in range(repeat):
+		latencies = []
+		count = run_operation(op, inserts, queries, latencies)
+		total_seconds = sum(latencies) / 1e9
+		ops_per_sec = count / total_seconds if total_seconds else float("inf")
+		if result is None or ops_per_sec > result["ops_per_sec"]:
+			result = {"ops_per_sec": ops_per_sec, "p50_us": percentile(latencies, 0.5) / 1000,
+					  "p99_us": percentile(latencies, 0.99) / 1000, "peak_kib": None}
+	if memory:
+		tracemalloc.start()
+		run_operation(op, inserts, queries, [])
+		result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+		tracemalloc.stop()
+	return result
+
+
+def run_benchmarks(ops, shapes, sizes, seed=0, memory=True, repeat=3, report=None):
+	"""
+	Output:
+		@type: dict
+		the result of run_benchmark for every combination, keyed "op/shape/n".
+	"""
+	results = {}
+	for n in sizes:
+		for shape in shapes:
+			for op in ops:
+				name = "%s/%s/%d" % (op, shape, n)
+				results[name] = run_benchmark(op, shape, n, seed, memory, repeat)
+				if report is not None:
+					report(name, results[name])
+	return results
+
+
+def compare(results, baseline, threshold):
+	"""
+	Input:
+		'results', 'baseline': dicts as returned by run_benchmarks
+		'threshold': float, the fraction of throughput a benchmark may lose
+	Output:
+		@type: list
+		(name, baseline ops/s, current ops/s) for every benchmark in both that lost more than threshold.
+	"""
+	regressions = []
+	for name, result in results.items():
+		if name in baseline:
+			before = baseline[name]["ops_per_sec"]
+			if result["ops_per_sec"] < before * (1 - threshold):
+				regressions.append((name, before, result["ops_per_sec"]))
+	return regressions
+
+
+def print_result(name, result):
+	peak = "%10.0f" % result["peak_kib"] if result["peak_kib"] is not None else "%10s" % "-"
+	print("%-36s %12.0f %10.2f %10.2f %s" % (name, result["ops_per_sec"], result["p50_us"], result["p99_us"], peak))
+	sys.stdout.flush()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+	parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+	parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark, the fastest is kept")
+	parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run of every benchmark")
+	parser.add_argument("--save", help="write the results to this JSON baseline")
+	parser.add_argument("--baseline", help="compare the results against this JSON baseline")
+	parser.add_argument("--threshold", type=float, default=0.25, help="allowed throughput loss, as a fraction")
+	args = parser.parse_args(argv)
+
+	print("%-36s %12s %10s %10s %10s" % ("benchmark", "ops/s", "p50 us", "p99 us", "peak KiB"))
+	results = run_benchmarks(args.ops, args.shapes, args.sizes, args.seed, not args.no_memory, args.repeat,
+							 print_result)
+	if args.save:
+		with open(args.save, "w") as f:
+			json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+					  f, indent=1, sort_keys=True)
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)["results"]
+		regressions = compare(results, baseline, args.threshold)
+		for name, before, after in regressions:
+			print("REGRESSION %s: %.0f -> %.0f ops/s (%.0f%%)" % (name, before, after, 100 * (after / before - 1)))
+		if regressions:
+			return 1
+		print("no regression beyond %.0f%% against %s" % (100 * args.threshold, args.baseline))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
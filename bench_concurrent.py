@@ -0,0 +1,102 @@
+"""Read throughput of a shared AVLTree under a global mutex vs. ConcurrentAVLTree, by number of reader threads
+
+usage (from the directory containing the package as src/):
+    python -m src.bench_concurrent [--size N] [--seconds S] [--threads 1 2 4 8] [--writers W]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from src.AVLTree import AVLTree
+from src.ConcurrentAVLTree import ConcurrentAVLTree
+
+
+class MutexAVLTree(object):
+	"""The baseline: every call, read or write, under one threading.Lock"""
+
+	def __init__(self, tree):
+		self.tree = tree
+		self.lock = threading.Lock()
+
+	def search(self, key):
+		with self.lock:
+			return self.tree.search(key)
+
+	def upsert(self, key, val=""):
+		with self.lock:
+			return self.tree.upsert(key, val)
+
+	def pop(self, key, default=None):
+		with self.lock:
+			return self.tree.pop(key, default)
+
+
+def run(shared, size, readers, writers, seconds):
+	"""
+	Input:
+		'shared': MutexAVLTree or ConcurrentAVLTree instance holding the even keys below 2 * size
+		'readers', 'writers': int, the number of threads of each kind
+		'seconds': float, how long to run
+	Output:
+		@type: float
+		the number of searches per second, summed over the reader threads.
+	Description:
+		Readers search random keys; writers toggle odd keys with pop and upsert, so the stored even keys stay put.
+	"""
+	stop = threading.Event()
+	counts = [0] * readers
+
+	def reader(index):
+		rng = random.Random(index)
+		done = 0
+		while not stop.is_set():
+			for _ in range(100):
+				shared.search(rng.randrange(2 * size))
+			done += 100
+		counts[index] = done
+
+	def writer(index):
+		rng = random.Random(-1 - index)
+		while not stop.is_set():
+			key = 2 * rng.randrange(size) + 1
+			# Each call takes the write lock once; a search before insert could race another writer
+			if shared.pop(key) is None:
+				shared.upsert(key, "")
+
+	threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+	threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+	start = time.perf_counter()
+	for thread in threads:
+		thread.start()
+	time.sleep(seconds)
+	stop.set()
+	for thread in threads:
+		thread.join()
+	return sum(counts) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--size", type=int, default=100000, help="number of keys in the tree")
+	parser.add_argument("--seconds", type=float, default=1.0, help="duration of every measurement")
+	parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="reader thread counts")
+	parser.add_argument("--writers", type=int, default=0, help="writer threads running alongside the readers")
+	args = parser.parse_args(argv)
+
+	gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+	print("python %s, GIL %s, %d keys, %d writer thread(s)"
+		  % (sys.version.split()[0], "enabled" if gil else "disabled", args.size, args.writers))
+	print("%8s %16s %16s" % ("readers", "mutex ops/s", "rwlock ops/s"))
+	for readers in args.threads:
+		results = []
+		for wrapper in (MutexAVLTree, ConcurrentAVLTree):
+			tree = AVLTree.from_sorted((2 * key, "") for key in range(args.size))
+			results.append(run(wrapper(tree), args.size, readers, args.writers, args.seconds))
+		print("%8d %16.0f %16.0f" % (readers, results[0], results[1]))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,71 @@
+"""Mid-sequence edits on a RopeAVLTree vs. a Python list, by sequence length
+
+usage (from the directory containing the package as src/):
+    python -m src.bench_rope [--sizes 10000 100000 1000000] [--edits E] [--seed S]
+"""
+
+import argparse
+import random
+import time
+
+from src.RopeAVLTree import RopeAVLTree
+
+OPERATIONS = ("insert", "delete", "split+concat")
+
+
+def run(sequence, operation, size, edits, seed):
+	"""
+	Input:
+		'sequence': RopeAVLTree or list instance of length size
+		'operation': one of OPERATIONS
+		'edits': int, the number of edits to time
+	Output:
+		@type: float
+		the number of edits per second.
+	Description:
+		Every edit happens at a random position in the middle half of the sequence; delete follows
+		each insert so the length stays put. split+concat cuts the sequence in two and glues the halves
+		back in the other order (slicing and adding for a list).
+	"""
+	rng = random.Random(seed)
+	positions = [rng.randrange(size // 4, 3 * size // 4) for _ in range(edits)]
+	is_rope = isinstance(sequence, RopeAVLTree)
+	start = time.perf_counter()
+	if operation == "insert":
+		insert = sequence.insert_at if is_rope else sequence.insert
+		for index in positions:
+			insert(index, index)
+	elif operation == "delete":
+		for index in positions:
+			if is_rope:
+				sequence.delete_at(index)
+			else:
+				del sequence[index]
+	else:
+		for index in positions:
+			if is_rope:
+				left, right = sequence.split_at(index)
+				right.concat(left)
+				sequence = right
+			else:
+				sequence = sequence[index:] + sequence[:index]
+	return edits / (time.perf_counter() - start)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+	parser.add_argument("--edits", type=int, default=2000, help="timed edits per measurement")
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args(argv)
+
+	print("%10s %14s %14s %14s %8s" % ("length", "operation", "rope edits/s", "list edits/s", "ratio"))
+	for size in args.sizes:
+		for operation in OPERATIONS:
+			rope = run(RopeAVLTree.from_iterable(range(size)), operation, size, args.edits, args.seed)
+			plain = run(list(range(size)), operation, size, args.edits, args.seed)
+			print("%10d %14s %14.0f %14.0f %8.2f" % (size, operation, rope, plain, rope / plain))
+
+
+if __name__ == "__main__":
+	main()
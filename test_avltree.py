@@ -1,7 +1,20 @@
+import sys
+import threading
+from array import array
+from pathlib import Path
 from typing import Optional
 import pytest
 from src.interfaces import AVLNodeProtocol, AVLTreeProtocol
 from src.AVLTree import AVLTree, AVLNode
+from src.AVLArrayTree import AVLArrayTree
+from src.PersistentAVLTree import PersistentAVLTree
+from src.ConcurrentAVLTree import ConcurrentAVLTree, ReadWriteLock
+from src import bench_avltree, bench_rope
+from src.OptimisticAVLTree import OptimisticAVLTree, VersionedAVLNode, versioned_write
+from src.AugmentedAVLTree import AugmentedAVLTree, Monoid, MIN, MAX
+from src.LazyAVLTree import LazyAVLTree
+from src.IntervalAVLTree import IntervalAVLTree
+from src.RopeAVLTree import RopeAVLTree
 
 
 def pre_order_keys_recursive(node: Optional[AVLNodeProtocol]) -> list[int]:
@@ -41,6 +54,22 @@ def test_is_real_node() -> None:
     assert AVLNode(5, "value").is_real_node()
 
 
+def test_node_is_slotted() -> None:
+    node = AVLNode(5, "value")
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.color = "red"  # type: ignore[attr-defined]
+
+    class DictNode:
+        def __init__(self) -> None:
+            self.key, self.value, self.parent = 5, "value", None
+            self.left, self.right, self.height = None, None, 0
+
+    dict_node = DictNode()
+    dict_size = sys.getsizeof(dict_node) + sys.getsizeof(dict_node.__dict__)
+    assert AVLNode.memory_footprint() < dict_size
+
+
 def test_search_empty_tree() -> None:
     tree: AVLTreeProtocol = AVLTree()
     assert (None, 0) == tree.search(2)
@@ -184,6 +213,28 @@ def test_finger_search_not_exsiting_key(basic_tree_insert: AVLTreeProtocol) -> N
     assert (None, 5) == basic_tree_insert.finger_search(0)
 
 
+def test_search_many(basic_tree_insert: AVLTreeProtocol) -> None:
+    tree = basic_tree_insert
+    assert isinstance(tree, AVLTree)
+    probes = [54, 3, 32, 8, 11, 0, 3]
+    results = tree.search_many(probes)
+    assert [node.key if node else None for node, _ in results] == [54, 3, None, 8, 11, None, 3]
+    assert results[5] == tree.search(0)
+    assert results[6][1] == 1
+    assert tree.search_many(array("q", [6, 15])) == tree.search_many([6, 15])
+    assert AVLTree().search_many([1, 2]) == [(None, 0), (None, 0)]
+    assert tree.search_many([]) == []
+
+
+def test_search_many_shares_paths() -> None:
+    tree = AVLTree.from_sorted(range(1024))
+    probes = list(range(500, 564))
+    results = tree.search_many(probes[::-1])
+    assert [node.key for node, _ in results] == probes[::-1]
+    single_edges = sum(tree.search(key)[1] for key in probes)
+    assert sum(edges for _, edges in results) < single_edges * 2 // 3
+
+
 def test_finger_insert_once_then_finger_search() -> None:
     tree: AVLTreeProtocol = AVLTree()
     tree.finger_insert(1, "val1")
@@ -238,6 +289,53 @@ def test_finger_search_through_root(basic_tree_insert: AVLTreeProtocol) -> None:
     assert basic_tree_insert.finger_search(3)[1] == 5
 
 
+def test_min_finger_search(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert isinstance(basic_tree_insert, AVLTree)
+    root = basic_tree_insert.get_root()
+    assert (root.left.left, 1) == basic_tree_insert.min_finger_search(3)
+    assert (root.left.right, 3) == basic_tree_insert.min_finger_search(6)
+    assert (root.right.right, 5) == basic_tree_insert.min_finger_search(54)
+    assert (None, 1) == basic_tree_insert.min_finger_search(0)
+
+
+def test_min_finger_insertions_decreasing_values() -> None:
+    tree = AVLTree()
+    assert tree.min_finger_insert(8, "")[1:] == (0, 0)
+    assert tree.min_finger_insert(7, "")[1:] == (1, 1)
+    assert tree.min_finger_insert(6, "")[1:] == (1, 1)
+    assert tree.min_finger_insert(5, "")[1:] == (1, 2)
+    assert pre_order_keys(tree) == [7, 6, 5, 8]
+    for key in range(4, 0, -1):
+        assert tree.min_finger_insert(key, "")[1] == 1
+    assert pre_order_keys(tree) == [5, 3, 2, 1, 4, 7, 6, 8]
+    assert tree.size() == 8
+    assert tree.min_node().key == 1 and tree.max_node().key == 8
+
+
+def test_min_node_through_updates(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert isinstance(basic_tree_insert, AVLTree)
+    assert basic_tree_insert.min_node().key == 3
+    basic_tree_insert.finger_insert(1, "")
+    assert basic_tree_insert.min_node().key == 1
+    basic_tree_insert.delete(basic_tree_insert.min_node())
+    basic_tree_insert.delete(basic_tree_insert.min_node())
+    assert basic_tree_insert.min_node().key == 4
+    left, right = basic_tree_insert.split(basic_tree_insert.search(8)[0])
+    assert left.min_node().key == 4 and right.min_node().key == 11
+    right.join(left, 8, "")
+    assert right.min_node().key == 4
+
+
+def test_auto_finger(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert isinstance(basic_tree_insert, AVLTree)
+    assert basic_tree_insert.auto_finger_search(4) == basic_tree_insert.min_finger_search(4)
+    assert basic_tree_insert.auto_finger_search(50) == basic_tree_insert.finger_search(50)
+    assert basic_tree_insert.auto_finger_insert(2, "")[1] == 1
+    assert basic_tree_insert.auto_finger_insert(60, "")[1] == 1
+    assert basic_tree_insert.min_node().key == 2 and basic_tree_insert.max_node().key == 60
+    assert AVLTree().auto_finger_search(1) == (None, 0)
+
+
 def test_single_left_rotation_finger() -> None:
     tree: AVLTreeProtocol = AVLTree()
     assert pre_order_keys(tree) == []
@@ -465,6 +563,721 @@ def test_avl_to_array(basic_tree_insert: AVLTreeProtocol) -> None:
     ]
 
 
+def test_subtree_sizes_through_updates(basic_tree_insert: AVLTreeProtocol) -> None:
+    tree = basic_tree_insert
+    assert (root := tree.get_root()) is not None
+    assert (root.size, root.left.size, root.right.size) == (7, 3, 3)
+    tree.delete(root)
+    assert tree.size() == 6
+    assert (root := tree.get_root()) is not None and root.size == 6
+    tree.finger_insert(60, "60")
+    assert (root := tree.get_root()) is not None and root.size == 7 == tree.size()
+
+
+def test_split_sizes(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert (root := basic_tree_insert.get_root()) is not None
+    (left, right) = basic_tree_insert.split(root.left.right)
+    assert (left.size(), right.size()) == (2, 4)
+    assert_max_node_key(left.max_node(), 4)
+    assert_max_node_key(right.max_node(), 54)
+    assert right.search(8)[0] is not None and right.search(8)[0].value == "8"
+
+
+def test_rank_select_count_range() -> None:
+    tree = AVLTree()
+    for key in range(0, 100, 3):
+        tree.insert(key, str(key))
+    assert tree.rank(0) == 0
+    assert tree.rank(3) == 1
+    assert tree.rank(4) == 2
+    assert tree.rank(1000) == 34
+    assert tree.select(0).key == 0
+    assert tree.select(10).key == 30
+    assert tree.select(33).key == 99
+    assert all(tree.select(tree.rank(key)).key == key for key in range(0, 100, 3))
+    with pytest.raises(IndexError):
+        tree.select(34)
+    with pytest.raises(IndexError):
+        tree.select(-1)
+    assert tree.count_range(10, 20) == 3
+    assert tree.count_range(0, 100) == 34
+    assert tree.count_range(20, 10) == 0
+    tree.delete(tree.search(12)[0])
+    assert tree.count_range(10, 20) == 2
+    assert tree.select(4).key == 15
+
+
+def test_range(basic_tree_insert: AVLTreeProtocol) -> None:
+    tree = basic_tree_insert
+    assert isinstance(tree, AVLTree)
+    assert list(tree.range(4, 15)) == [(4, "4"), (6, "6"), (8, "8"), (11, "11")]
+    assert list(tree.range(5, 16, reverse=True)) == [(15, "15"), (11, "11"), (8, "8"), (6, "6")]
+    assert list(tree.range(0, 100)) == tree.avl_to_array()
+    assert list(tree.range(0, 100, reverse=True)) == tree.avl_to_array()[::-1]
+    assert list(tree.range(55, 100)) == []
+    assert list(tree.range(9, 9)) == []
+    assert list(AVLTree().range(0, 10, reverse=True)) == []
+
+
+def test_range_is_lazy() -> None:
+    tree = AVLTree.from_sorted(range(10000))
+    scan = tree.range(5000, 10000)
+    assert next(scan) == (5000, "")
+    assert next(scan) == (5001, "")
+    assert tree.ceiling_node(10000).is_real_node() is False
+    assert tree.lower_node(0).is_real_node() is False
+    assert tree.lower_node(5000).key == 4999
+
+
+def test_join_max_node() -> None:
+    tree1 = AVLTree.from_sorted(range(10))
+    tree2 = AVLTree.from_sorted(range(20, 60))
+    tree1.join(tree2, 15, "")
+    assert_max_node_key(tree1.max_node(), 59)
+    tree3 = AVLTree.from_sorted(range(-50, -10))
+    tree1.join(tree3, -5, "")
+    assert_max_node_key(tree1.max_node(), 59)
+    assert tree1.size() == 92
+
+
+def test_split_by_key(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert isinstance(basic_tree_insert, AVLTree)
+    left, node, right = basic_tree_insert.split_by_key(7)
+    assert node is None
+    assert list(left) == [3, 4, 6] and list(right) == [8, 11, 15, 54]
+    assert (left.size(), right.size()) == (3, 4)
+    left, node, right = AVLTree.from_sorted(range(10)).split_by_key(4)
+    assert node is not None and node.key == 4
+    assert list(left) == [0, 1, 2, 3] and list(right) == [5, 6, 7, 8, 9]
+
+
+def test_insert_many() -> None:
+    tree = AVLTree()
+    for key in [50, 20, 80, 10]:
+        tree.insert(key, "old")
+    inserted, promotions = tree.insert_many([(30, "new"), (5, "new"), (80, "new"), (90, "new"), (30, "last")])
+    assert inserted == 3
+    assert promotions >= 0
+    assert tree.avl_to_array() == [
+        (5, "new"), (10, "old"), (20, "old"), (30, "last"), (50, "old"), (80, "new"), (90, "new")
+    ]
+    assert tree.size() == 7
+    assert_max_node_key(tree.max_node(), 90)
+    assert (root := tree.get_root()) is not None
+    assert_avl_heights(root)
+    assert tree.insert_many([]) == (0, 0)
+
+
+def test_insert_many_large_batch() -> None:
+    tree = AVLTree.from_sorted(range(0, 2000, 2))
+    tree.insert_many((key, "odd") for key in range(1999, 0, -2))
+    assert list(tree) == list(range(2000))
+    assert tree.size() == 2000
+    assert (root := tree.get_root()) is not None
+    assert root.size == 2000
+    assert_avl_heights(root)
+    assert tree.search(1001)[0].value == "odd"
+
+
+def set_operands() -> tuple[AVLTree, AVLTree]:
+    tree1 = AVLTree.from_sorted((key, "a") for key in range(0, 40, 2))
+    tree2 = AVLTree()
+    for key in range(30, 0, -3):
+        tree2.insert(key, "b")
+    return tree1, tree2
+
+
+def test_union() -> None:
+    tree1, tree2 = set_operands()
+    tree1.union(tree2)
+    expected = {**{key: "a" for key in range(0, 40, 2)}, **{key: "b" for key in range(3, 31, 3)}}
+    assert tree1.avl_to_array() == sorted(expected.items())
+    assert tree1.size() == len(expected) and tree2.size() == 0
+    assert_max_node_key(tree1.max_node(), 38)
+
+
+def test_intersection() -> None:
+    tree1, tree2 = set_operands()
+    tree1.intersection(tree2)
+    assert tree1.avl_to_array() == [(6, "a"), (12, "a"), (18, "a"), (24, "a"), (30, "a")]
+    assert tree1.size() == 5 and tree2.size() == 0
+    assert (root := tree1.get_root()) is not None
+    assert_avl_heights(root)
+
+
+def test_difference() -> None:
+    tree1, tree2 = set_operands()
+    tree1.difference(tree2)
+    assert list(tree1) == [key for key in range(0, 40, 2) if key not in range(3, 31, 3)]
+    assert tree1.size() == 15
+    assert_max_node_key(tree1.max_node(), 38)
+
+
+def test_symmetric_difference() -> None:
+    tree1, tree2 = set_operands()
+    tree1.symmetric_difference(tree2)
+    keys1, keys2 = set(range(0, 40, 2)), set(range(3, 31, 3))
+    assert list(tree1) == sorted(keys1 ^ keys2)
+    assert tree1.search(9)[0].value == "b" and tree1.search(8)[0].value == "a"
+    assert (root := tree1.get_root()) is not None
+    assert_avl_heights(root)
+
+
+def test_set_operations_with_empty() -> None:
+    tree1, _ = set_operands()
+    tree1.intersection(AVLTree())
+    assert tree1.size() == 0 and tree1.get_root() is None
+    tree1, _ = set_operands()
+    tree1.difference(AVLTree())
+    assert tree1.size() == 20
+    empty = AVLTree()
+    empty.symmetric_difference(set_operands()[1])
+    assert empty.size() == 10
+
+
+def test_concat() -> None:
+    tree1 = AVLTree.from_sorted(range(10))
+    tree2 = AVLTree.from_sorted(range(100, 103))
+    tree2.concat(tree1)
+    assert list(tree2) == list(range(10)) + [100, 101, 102]
+    assert tree2.size() == 13 and tree1.size() == 0
+    assert_max_node_key(tree2.max_node(), 102)
+
+
+def test_cursor_moves() -> None:
+    tree = AVLTree.from_sorted(range(0, 100, 2))
+    cursor = tree.cursor()
+    assert cursor.node.key == 0
+    assert cursor.next().key == 2
+    assert cursor.advance(10).key == 22
+    assert cursor.advance(-5).key == 12
+    assert cursor.prev().key == 10
+    assert cursor.seek(51).key == 52
+    assert cursor.seek(7).key == 8
+    assert not cursor.seek(99).is_real_node()
+    assert cursor.prev().key == 98
+    assert not cursor.advance(-50).is_real_node()
+    assert cursor.next().key == 0
+
+
+def test_cursor_survives_updates() -> None:
+    tree = AVLTree.from_sorted(range(0, 100, 2))
+    cursor = tree.cursor(40)
+    for key in range(1, 100, 2):
+        tree.insert(key, "")
+    assert cursor.node.key == 40 and cursor.next().key == 41
+    tree.delete(tree.search(41)[0])
+    tree.delete(tree.search(42)[0])
+    assert cursor.next().key == 43
+    assert cursor.advance(-3).key == 38
+    tree.delete(cursor.node)
+    assert cursor.prev().key == 37
+
+
+def test_dump_load(tmp_path: Path) -> None:
+    items = [(-5, "a"), (0, None), (3, ""), (300, "\u00e9\u00e8"), (2 ** 40, "x" * 1000)]
+    tree = AVLTree.from_sorted(items)
+    path = tmp_path / "tree.avlt"
+    tree.dump(path)
+    loaded = AVLTree.load(path)
+    assert loaded.avl_to_array() == items
+    assert loaded.size() == 5 and loaded.max_node().key == 2 ** 40
+    assert_avl_heights(loaded.root)
+    AVLTree().dump(path)
+    assert AVLTree.load(path).size() == 0
+    with pytest.raises(ValueError, match="int64"):
+        AVLTree.from_sorted([(0, "a"), (2 ** 70, "b")]).dump(path)
+
+
+def test_load_rejects_truncated_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "tree.avlt"
+    AVLTree.from_sorted([(key, str(key)) for key in range(0, 3000, 3)]).dump(path)
+    data = path.read_bytes()
+    for size in [len(data) - 1, len(data) // 2, AVLTree.SNAPSHOT_HEADER.size + 4]:
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError, match="truncated snapshot"):
+            AVLTree.load(path)
+
+
+def test_load_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "not_a_tree"
+    path.write_bytes(b"hello world, this is not a tree")
+    with pytest.raises(ValueError):
+        AVLTree.load(path)
+
+
+def test_persistent_versions_are_unchanged() -> None:
+    empty = PersistentAVLTree()
+    versions = [empty]
+    for key in [8, 4, 3, 6, 15, 11, 54]:
+        versions.append(versions[-1].insert(key, str(key)))
+    full = versions[-1]
+    assert pre_order_keys(full) == [8, 4, 3, 6, 15, 11, 54]
+    assert [version.size() for version in versions] == list(range(8))
+    assert list(versions[3]) == [3, 4, 8]
+    smaller = full.delete(8)
+    assert list(smaller) == [3, 4, 6, 11, 15, 54]
+    assert list(full) == [3, 4, 6, 8, 11, 15, 54]
+    assert full.delete(100) is full
+    assert empty.size() == 0 and empty.get_root() is None
+
+
+def test_persistent_shares_untouched_subtrees() -> None:
+    tree = PersistentAVLTree.from_sorted((key, "") for key in range(1023))
+    updated = tree.insert(2000, "")
+    assert updated.root.left is tree.root.left
+    assert tree.search(2000) == (None, 10)
+    assert updated.search(2000)[0].key == 2000
+
+
+def test_persistent_split_join() -> None:
+    tree = PersistentAVLTree.from_sorted((key, str(key)) for key in range(100))
+    left, right = tree.split(40)
+    assert list(left) == list(range(40)) and list(right) == list(range(41, 100))
+    joined = right.join(left, 40, "new")
+    assert joined.avl_to_array() == [(key, "new" if key == 40 else str(key)) for key in range(100)]
+    stack = [joined.root]
+    while stack:
+        node = stack.pop()
+        if node.is_real_node():
+            assert abs(node.left.height - node.right.height) <= 1
+            stack += [node.left, node.right]
+    assert tree.size() == 100 and tree.search(40)[0].value == "40"
+
+
+def test_read_write_lock_shares_reads() -> None:
+    lock = ReadWriteLock()
+    both_reading = threading.Barrier(2, timeout=5)
+
+    def reader() -> None:
+        with lock.read_locked:
+            both_reading.wait()
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    reader()
+    thread.join()
+    with lock.write_locked:
+        assert lock.writer and lock.readers == 0
+
+
+def test_concurrent_tree_threads() -> None:
+    tree = ConcurrentAVLTree(AVLTree.from_sorted(range(0, 2000, 2)))
+    errors = []
+
+    def writer(offset: int) -> None:
+        for key in range(1 + 2 * offset, 2000, 8):
+            tree.insert(key, "")
+        for key in range(1 + 2 * offset, 2000, 16):
+            tree.delete_key(key)
+
+    def reader() -> None:
+        for key in range(0, 2000, 2):
+            if tree.search(key)[0] is None:
+                errors.append(key)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    expected = set(range(2000)) - {key for offset in range(4) for key in range(1 + 2 * offset, 2000, 16)}
+    assert [key for key, _ in tree.avl_to_array()] == sorted(expected)
+    assert tree.size() == len(expected)
+    assert_avl_heights(tree.tree.root)
+
+
+def test_concurrent_tree_batch() -> None:
+    tree = ConcurrentAVLTree()
+    results = tree.apply_batch([("insert", 2, "b"), ("insert", 1, "a"), ("search", 2)])
+    assert results[2][0].value == "b"
+    with tree.batch() as avl:
+        avl.delete(avl.search(1)[0])
+    assert tree.avl_to_array() == [(2, "b")]
+
+
+def test_concurrent_tree_set_operations() -> None:
+    for operation, expected in [("union", [0, 1, 2, 3, 4]), ("intersection", [2]), ("difference", [0, 1]),
+                                ("symmetric_difference", [0, 1, 3, 4])]:
+        tree = ConcurrentAVLTree(AVLTree.from_sorted([(0, ""), (1, ""), (2, "")]))
+        tree2 = ConcurrentAVLTree(AVLTree.from_sorted([(2, ""), (3, ""), (4, "")]))
+        getattr(tree, operation)(tree2)
+        assert [key for key, _ in tree.avl_to_array()] == expected
+        assert tree2.size() == 0
+    tree = ConcurrentAVLTree(AVLTree.from_sorted([(0, "")]))
+    with pytest.raises(ValueError):
+        tree.union(tree)
+    with pytest.raises(ValueError):
+        tree.join(tree, 5)
+    tree.insert(1, "")
+    assert tree.size() == 2
+
+
+def test_shared_delete_skips_stale_nodes() -> None:
+    for tree in [ConcurrentAVLTree(), OptimisticAVLTree()]:
+        for key in range(20):
+            tree.insert(key, str(key))
+        stale = tree.search(7)[0]
+        assert tree.delete_key(7)
+        tree.insert(7, "again")
+        assert tree.delete(stale) is None and tree.delete(stale) is None
+        assert tree.size() == 20 and tree.search(7)[0].value == "again"
+        assert tree.delete(tree.search(7)[0]) is tree.get_root()
+        assert [key for key, _ in tree.avl_to_array()] == [key for key in range(20) if key != 7]
+        assert_avl_heights(tree.get_root())
+
+
+def test_versioned_nodes_through_updates() -> None:
+    tree = OptimisticAVLTree()
+    for key in [8, 4, 3, 6, 15, 11, 54]:
+        tree.insert(key, str(key))
+    tree.delete_key(8)
+    assert pre_order_keys(tree) == [11, 4, 3, 6, 15, 54]
+    stack = [tree.tree.root]
+    while stack:
+        node = stack.pop()
+        if node.is_real_node():
+            assert type(node) is VersionedAVLNode and node.version % 2 == 0
+            stack += [node.left, node.right]
+    assert tree.search(6) == (tree.get_root().left.right, 3)
+    assert tree.search(7) == (None, 3)
+
+
+def test_optimistic_search_sees_writes_in_progress() -> None:
+    tree = OptimisticAVLTree.from_sorted((key, "") for key in range(15))
+    root = tree.tree.root
+    with versioned_write():
+        root.value = "changing"
+        assert tree.optimistic_search(3) is None
+    assert tree.optimistic_search(3) == (root.left, 2)
+
+
+def test_optimistic_tree_threads() -> None:
+    tree = OptimisticAVLTree.from_sorted((key, "") for key in range(0, 2000, 2))
+    missed = []
+
+    def writer(offset: int) -> None:
+        for key in range(1 + 2 * offset, 2000, 4):
+            tree.insert(key, "")
+            if key % 3 == 0:
+                tree.delete_key(key)
+
+    def reader() -> None:
+        for _ in range(3):
+            for key in range(0, 2000, 2):
+                if tree.search(key)[0] is None:
+                    missed.append(key)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(2)]
+    threads += [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert missed == []
+    assert [key for key, _ in tree.avl_to_array()] == [key for key in range(2000) if key % 2 == 0 or key % 3]
+
+
+def test_stats_disabled_by_default(basic_tree_insert: AVLTreeProtocol) -> None:
+    assert isinstance(basic_tree_insert, AVLTree)
+    assert basic_tree_insert.stats is None
+    basic_tree_insert.search(4)
+    assert AVLTree.stats is None
+
+
+def test_stats_counters() -> None:
+    tree = AVLTree()
+    stats = tree.enable_stats()
+    for key in [1, 2, 3]:
+        tree.insert(key, "")
+    tree.insert(5, "")
+    tree.insert(4, "")
+    assert stats.single_rotations == 1 and stats.double_rotations == 1
+    assert stats.operations["insert"] == 5
+    assert stats.path_lengths["insert"] == {0: 1, 1: 1, 2: 2, 3: 1}
+    tree.search(4)
+    tree.finger_search(1)
+    tree.delete(tree.search(1)[0])
+    assert stats.operations["search"] == 2 and stats.operations["delete"] == 1
+    left, right = tree.split(tree.search(4)[0])
+    assert stats.operations["split"] == 1 and sum(stats.split_pieces.values()) == 1
+    assert left.stats is stats and right.stats is stats
+    summary = stats.summary()
+    assert summary["path_lengths"]["insert"]["p50"] == 2
+    assert summary["promotions"] == stats.promotions > 0
+    tree.disable_stats()
+    assert tree.stats is None
+
+
+def test_rebalance_stops_early() -> None:
+    tree = AVLTree()
+    stats = tree.enable_stats()
+    keys = list(range(1024)) + [1024 + key * 7919 % 3072 for key in range(1000)]
+    for key in keys:
+        tree.insert(key, "")
+    assert stats.rebalance_steps < 4 * len(keys)
+    assert_avl_heights(tree.root)
+    stats.rebalance_steps = 0
+    for key in keys[::2]:
+        tree.delete(tree.search(key)[0])
+    assert stats.rebalance_steps < 5 * len(keys[::2])
+    assert_avl_heights(tree.root)
+    assert tree.root.size == tree.size() == len(keys) // 2
+    assert [tree.rank(key) for key in keys[1:200:2]] == list(range(100))
+    assert tree.root.parent is None and tree.min_node().key == 1 and tree.max_node().key == max(keys[1::2])
+
+
+def assert_threaded(tree: AVLTree) -> None:
+    nodes = []
+    stack, node = [], tree.root
+    while stack or node.is_real_node():
+        while node.is_real_node():
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        nodes.append(node)
+        node = node.right
+    assert [node.next for node in nodes] == nodes[1:] + [None]
+    assert [node.prev for node in nodes] == [None] + nodes[:-1]
+    if nodes:
+        assert tree.min_node() is nodes[0] and tree.max_node() is nodes[-1]
+
+
+def test_threaded_neighbours() -> None:
+    tree = AVLTree()
+    for key in [8, 4, 3, 6, 15, 11, 54, 5, 7, 1, 2]:
+        tree.insert(key, str(key))
+    assert_threaded(tree)
+    node = tree.search(6)[0]
+    assert node.successor().key == 7 and node.predecessor().key == 5
+    assert not tree.search(54)[0].successor().is_real_node()
+    for key in [54, 1, 6, 8]:
+        tree.delete(tree.search(key)[0])
+        assert_threaded(tree)
+    assert list(tree.range(3, 12)) == [(3, "3"), (4, "4"), (5, "5"), (7, "7"), (11, "11")]
+    assert [key for key, _ in tree.range(3, 12, reverse=True)] == [11, 7, 5, 4, 3]
+    left, right = tree.split(tree.search(5)[0])
+    assert_threaded(left)
+    assert_threaded(right)
+    left.join(right, 5, "5")
+    assert_threaded(left)
+    other = AVLTree.from_sorted([(key, "") for key in range(0, 40, 3)])
+    assert_threaded(other)
+    left.symmetric_difference(other)
+    assert_threaded(left)
+    cursor = left.cursor(4)
+    assert [cursor.next().key, cursor.next().key, cursor.prev().key] == [5, 6, 5]
+
+
+def test_augmented_aggregates() -> None:
+    def brute(items, lo, hi, combine, identity):
+        result = identity
+        for key, value in sorted(items.items()):
+            if lo <= key < hi:
+                result = combine(result, value)
+        return result
+
+    concat = Monoid(lambda a, b: a + b, "", str)
+    for monoid, combine, identity in [(None, lambda a, b: a + b, 0), (MIN, min, float("inf")),
+                                      (MAX, max, float("-inf")), (concat, lambda a, b: a + str(b), "")]:
+        tree = AugmentedAVLTree() if monoid is None else AugmentedAVLTree(monoid=monoid)
+        items = {}
+        for key in range(0, 200, 3):
+            items[key] = 1024 + key * 7919 % 3072
+            tree.insert(key, items[key])
+        for key in range(0, 200, 9):
+            tree.delete(tree.search(key)[0])
+            del items[key]
+        tree.set_value(tree.search(102)[0], 5)
+        items[102] = 5
+        for lo, hi in [(0, 200), (10, 11), (13, 150), (50, 40), (-5, 7), (199, 400)]:
+            assert tree.aggregate(lo, hi) == brute(items, lo, hi, combine, identity)
+        assert tree.aggregate() == brute(items, -1, 200, combine, identity)
+
+        node = tree.search(120)[0]
+        left, right = tree.split(node)
+        assert left.aggregate() == brute(items, -1, 120, combine, identity)
+        assert right.aggregate(130) == brute(items, 130, 200, combine, identity)
+        left.join(right, 120, items[120])
+        other = AugmentedAVLTree.from_sorted([(key, key) for key in range(201, 260)], left.monoid)
+        left.union(other)
+        items.update((key, key) for key in range(201, 260))
+        assert left.aggregate(100, 230) == brute(items, 100, 230, combine, identity)
+        assert left.root.size == len(items)
+
+
+def test_lazy_range_updates() -> None:
+    tree = LazyAVLTree.from_sorted([(key, 100) for key in range(0, 1000, 2)])
+    tree.add_range(100, 900, 5)
+    tree.assign_range(400, 500, 0)
+    tree.add_range(450, None, -1)
+    tagged, stack = 0, [tree.root]
+    while stack:
+        node = stack.pop()
+        if node.is_real_node():
+            tagged += node.pending is not None
+            stack += [node.left, node.right]
+    assert 0 < tagged <= 4 * tree.root.height
+
+    expected = {}
+    for key in range(0, 1000, 2):
+        val = 100 + 5 * (100 <= key < 900)
+        val = 0 if 400 <= key < 500 else val
+        expected[key] = val - (key >= 450)
+    for key in [0, 100, 398, 400, 448, 450, 498, 500, 898, 900, 998]:
+        assert tree.search(key)[0].value == expected[key]
+    for key in range(1, 1000, 50):
+        tree.insert(key, 7)
+        expected[key] = 7
+    tree.add_range(None, 600, 1)
+    expected = {key: val + (key < 600) for key, val in expected.items()}
+    for key in range(0, 1000, 6):
+        tree.delete(tree.search(key)[0])
+        del expected[key]
+    assert list(tree.range(440, 460)) == [(key, expected[key]) for key in sorted(expected) if 440 <= key < 460]
+    left, right = tree.split(tree.search(500)[0])
+    right.assign_range(None, 700, 3)
+    expected.update((key, 3) for key in expected if 500 < key < 700)
+    left.join(right, 500, expected[500])
+    assert left.avl_to_array() == sorted(expected.items())
+    assert_avl_heights(left.root)
+
+
+def test_interval_queries() -> None:
+    tree = IntervalAVLTree()
+    intervals = [(1, 3), (2, 40), (5, 6), (8, 12), (10, 11), (15, 30), (25, 26), (33, 50)]
+    for start, end in intervals:
+        tree.insert_interval(start, end, str(start))
+    with pytest.raises(ValueError):
+        tree.insert_interval(60, 60)
+
+    def brute(lo: int, hi: int) -> list[int]:
+        return [start for start, end in intervals if start < hi and end > lo]
+
+    assert [start for start, _, _ in tree.overlapping(9, 11)] == brute(9, 11) == [2, 8, 10]
+    assert [start for start, _, _ in tree.stab(10)] == [2, 8, 10]
+    assert [start for start, _, _ in tree.stab(12)] == [2]
+    assert list(tree.overlapping(0, 1)) == []
+    tree.delete(tree.search(2)[0])
+    intervals.remove((2, 40))
+    for lo, hi in [(0, 100), (6, 8), (12, 15), (26, 33), (29, 34)]:
+        assert [start for start, _, _ in tree.overlapping(lo, hi)] == brute(lo, hi)
+    left, right = tree.split(tree.search(15)[0])
+    assert left.root.aggregate == 12 and right.root.aggregate == 50
+    left.join(right, 15, (30, "15"))
+    assert left.root.aggregate == 50
+    assert [start for start, _, _ in left.stab(29)] == [15]
+
+
+def test_rope_positional_edits() -> None:
+    expected = list("abcdefghij")
+    rope = RopeAVLTree.from_iterable(expected)
+    node = rope.insert_at(3, "X")
+    expected.insert(3, "X")
+    rope.insert_at(0, "first")
+    rope.insert_at(len(rope), "last")
+    rope.insert_at(-1, "Y")
+    expected = ["first"] + expected
+    expected.insert(len(expected), "last")
+    expected.insert(-1, "Y")
+    assert list(rope) == expected and len(rope) == len(expected)
+    assert rope.index_of(node) == 4 and rope[4] == "X" and rope[-1] == "last"
+    assert rope.delete_at(5) == expected.pop(5)
+    rope[-2] = "Z"
+    expected[-2] = "Z"
+    assert list(rope.slice(2, -2)) == expected[2:-2] and list(rope) == expected
+    with pytest.raises(IndexError):
+        rope.delete_at(len(expected))
+
+    for _ in range(200):
+        rope.insert_at(len(rope) // 2, "m")
+        expected.insert(len(expected) // 2, "m")
+    assert list(rope) == expected
+    assert_avl_heights(rope.root)
+    left, right = rope.split_at(7)
+    assert list(left) == expected[:7] and list(right) == expected[7:]
+    right.concat(left)
+    assert list(right) == expected[7:] + expected[:7]
+    assert right.min_node().value == expected[7] and right.max_node().value == expected[6]
+    assert_avl_heights(right.root)
+    assert bench_rope.run(RopeAVLTree.from_iterable(range(100)), "split+concat", 100, 10, 0) > 0
+
+
+def test_upsert_get_or_insert_pop() -> None:
+    tree = AVLTree()
+    stats = tree.enable_stats()
+    node, e, promotions = tree.upsert(5, "five")
+    assert (node.key, node.value, e, promotions) == (5, "five", 0, 0)
+    assert stats.operations["upsert"] == 1 and stats.operations["insert"] == 0
+    for key in [3, 8, 1, 4, 7, 9]:
+        tree.upsert(key, str(key))
+    stats = tree.enable_stats()
+    node, e, promotions = tree.upsert(4, "four")
+    assert promotions is None and node is tree.search(4)[0] and node.value == "four"
+    assert e == tree.search(4)[1]
+    node, e, promotions = tree.upsert(6, "6")
+    assert promotions is not None and tree.size() == 8
+    assert stats.operations["upsert"] == 2
+
+    made = []
+    empty = AVLTree()
+    empty_stats = empty.enable_stats()
+    assert empty.get_or_insert(1, lambda: "one").value == "one" and empty.size() == 1
+    assert empty_stats.operations["get_or_insert"] == 1 and empty_stats.operations["insert"] == 0
+    assert tree.get_or_insert(7, lambda: made.append(7) or "new").value == "7" and made == []
+    assert tree.get_or_insert(2, lambda: made.append(2) or "two").value == "two" and made == [2]
+    assert tree.pop(8) == "8" and tree.pop(8) is None and tree.pop(8, "gone") == "gone"
+    assert tree.avl_to_array() == [(1, "1"), (2, "two"), (3, "3"), (4, "four"), (5, "five"), (6, "6"),
+                                   (7, "7"), (9, "9")]
+    assert tree.size() == 8 and tree.max_node().key == 9
+    assert_avl_heights(tree.root)
+    assert_threaded(tree)
+
+    summed = AugmentedAVLTree.from_sorted([(key, key) for key in range(10)])
+    summed.upsert(3, 100)
+    summed.get_or_insert(20, lambda: 5)
+    summed.pop(9)
+    assert summed.aggregate() == 45 - 3 + 100 + 5 - 9
+    shared = ConcurrentAVLTree()
+    shared.upsert(1, "a")
+    assert shared.get_or_insert(1, lambda: "b").value == "a" and shared.pop(1) == "a"
+
+
+def test_benchmark_smoke(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    arguments = ["--sizes", "200", "--repeat", "1", "--no-memory"]
+    assert bench_avltree.main(arguments + ["--save", str(baseline)]) == 0
+    assert bench_avltree.main(arguments + ["--baseline", str(baseline), "--threshold", "0.99"]) == 0
+    results = bench_avltree.run_benchmarks(["search"], ["zipfian"], [200], repeat=1)
+    inflated = {"search/zipfian/200": {"ops_per_sec": results["search/zipfian/200"]["ops_per_sec"] * 10}}
+    assert [name for name, _, _ in bench_avltree.compare(results, inflated, 0.25)] == ["search/zipfian/200"]
+    assert results["search/zipfian/200"]["peak_kib"] > 0
+    for shape in bench_avltree.SHAPES:
+        inserts, queries = bench_avltree.key_streams(shape, 100, 0)
+        assert sorted(inserts) == list(range(0, 200, 2)) and len(queries) == 100
+
+
+def test_lazy_iteration(basic_tree_insert: AVLTreeProtocol) -> None:
+    tree = basic_tree_insert
+    assert isinstance(tree, AVLTree)
+    assert list(tree) == [3, 4, 6, 8, 11, 15, 54]
+    assert list(tree.keys()) == [3, 4, 6, 8, 11, 15, 54]
+    assert list(tree.values()) == ["3", "4", "6", "8", "11", "15", "54"]
+    items = tree.items()
+    assert next(items) == (3, "3")
+    assert next(items) == (4, "4")
+    assert list(AVLTree().items()) == []
+
+
+def test_iteration_large_tree() -> None:
+    tree = AVLTree()
+    for key in range(2000):
+        tree.finger_insert(key, "")
+    assert list(tree) == list(range(2000))
+
+
 def test_size(basic_tree_insert: AVLTreeProtocol) -> None:
     tree: AVLTreeProtocol = AVLTree()
     assert tree.size() == 0
@@ -484,6 +1297,112 @@ def test_size(basic_tree_insert: AVLTreeProtocol) -> None:
     assert tree.size() == 17
 
 
+def assert_avl_heights(node: AVLNodeProtocol) -> int:
+    if not node.is_real_node():
+        return -1
+    left_height = assert_avl_heights(node.left)
+    right_height = assert_avl_heights(node.right)
+    assert abs(left_height - right_height) <= 1
+    assert node.height == max(left_height, right_height) + 1
+    if node.left.is_real_node():
+        assert node.left.parent is node
+    if node.right.is_real_node():
+        assert node.right.parent is node
+    return node.height
+
+
+def test_from_sorted() -> None:
+    items = [(key, str(key)) for key in range(0, 200, 2)]
+    tree = AVLTree.from_sorted(items)
+    assert tree.avl_to_array() == items
+    assert tree.size() == 100
+    assert_max_node_key(tree.max_node(), 198)
+    assert (root := tree.get_root()) is not None and root.parent is None
+    assert assert_avl_heights(root) == 6
+    assert tree.finger_search(190)[0] is not None
+    tree.insert(7, "7")
+    assert tree.search(7)[0] is not None
+
+
+def test_from_sorted_keys_and_empty() -> None:
+    tree = AVLTree.from_sorted(iter([1, 2, 3]))
+    assert pre_order_keys(tree) == [2, 1, 3]
+    assert tree.avl_to_array() == [(1, ""), (2, ""), (3, "")]
+    empty = AVLTree.from_sorted([])
+    assert empty.get_root() is None and empty.size() == 0
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([3, 2])
+    with pytest.raises(ValueError):
+        AVLTree.from_sorted([1, 1])
+
+
+def test_array_tree_matches_node_tree() -> None:
+    array_tree: AVLTreeProtocol = AVLArrayTree()
+    node_tree: AVLTreeProtocol = AVLTree()
+    for key in [8, 4, 3, 6, 15, 11, 54, 1, 2, 70, 65]:
+        assert array_tree.insert(key, str(key))[1:] == node_tree.insert(key, str(key))[1:]
+    assert pre_order_keys(array_tree) == pre_order_keys(node_tree)
+    assert array_tree.avl_to_array() == node_tree.avl_to_array()
+    assert array_tree.finger_search(6)[1] == node_tree.finger_search(6)[1]
+    assert_max_node_key(array_tree.max_node(), 70)
+
+
+def test_array_tree_delete() -> None:
+    tree = AVLArrayTree()
+    for key in range(1, 16):
+        tree.finger_insert(key, str(key))
+    for key in [8, 15, 1, 14]:
+        node, _ = tree.search(key)
+        tree.delete(node)
+    assert [key for key, _ in tree.avl_to_array()] == [2, 3, 4, 5, 6, 7, 9, 10, 11, 12, 13]
+    assert tree.size() == 11
+    assert_max_node_key(tree.max_node(), 13)
+    tree.insert(20, "20")
+    assert len(tree.pool.keys) == 16
+
+
+def test_array_tree_split_and_join() -> None:
+    tree = AVLArrayTree()
+    for key in range(20):
+        tree.insert(key, str(key))
+    node, _ = tree.search(7)
+    left, right = tree.split(node)
+    assert left.avl_to_array() == [(key, str(key)) for key in range(7)]
+    assert right.avl_to_array() == [(key, str(key)) for key in range(8, 20)]
+    assert (left.size(), right.size()) == (7, 12)
+    assert left.pool is right.pool
+    left.join(right, 7, "seven")
+    assert [key for key, _ in left.avl_to_array()] == list(range(20))
+    assert left.size() == 20 and right.size() == 0
+    assert_max_node_key(left.max_node(), 19)
+
+    other = AVLArrayTree()
+    other.insert(-2, "")
+    left.join(other, -1, "")
+    assert left.size() == 22
+    assert left.avl_to_array()[:2] == [(-2, ""), (-1, "")]
+
+
+def test_array_tree_keeps_removed_node_readable() -> None:
+    tree = AVLArrayTree()
+    for key in range(10):
+        tree.insert(key, f"v{key}")
+    node, _ = tree.search(5)
+    left, right = tree.split(node)
+    right.insert(100, "100 new")
+    assert (node.key, node.value) == (5, "v5")
+    left.join(right, node.key, node.value)
+    assert left.avl_to_array() == [(key, f"v{key}") for key in range(10)] + [(100, "100 new")]
+
+    node, _ = left.search(3)
+    left.delete(node)
+    left.insert(200, "200 new")
+    assert (node.key, node.value) == (3, "v3")
+    free_before = len(left.pool.free_handles)
+    del node
+    assert len(left.pool.free_handles) == free_before + 1
+
+
 def print_tree(node=None, level=0, prefix="Root: ") -> None:
     if node is not None:
         print(" " * (level * 4) + prefix + f"({node.key})")